@@ -1,625 +1,1298 @@
-import sys
-import json
-import time
-import os
-import uuid
-import socket
-import copy
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QGridLayout, QFrame, QDialog, QLineEdit,
-    QDialogButtonBox, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox,
-    QFileDialog, QSizePolicy, QListWidget, QListWidgetItem, QGroupBox,
-    QRadioButton, QComboBox, QMessageBox, QMenu, QStackedWidget
-)
-from PySide6.QtCore import Qt, Slot, Signal, QTimer, QObject, QThread
-from PySide6.QtGui import QPalette, QColor, QFont, QAction
-
-# =============================================================================
-# --- GLOBAL CONFIGURATION ---
-# =============================================================================
-MQTT_BROKER = "localhost" # Default for transmitter, receiver will load from config
-MQTT_PORT = 1883
-MQTT_APP_ID = "cuelight_system"
-ZEROCONF_SERVICE_TYPE = "_cuelight-mqtt._tcp.local."
-
-ROLE_CONFIG_FILE = "device_role.json"
-RECEIVER_CONFIG_FILE = "receiver_config.json"
-DEFAULT_SHOW_FILE = "last_show.qlx"
-
-COLOR_OPTIONS_PY = { 
-    "White": ("#FFFFFF", "#000000"), "Cyan": ("#00BCD4", "#000000"),
-    "Magenta": ("#E91E63", "#FFFFFF"), "Yellow": ("#FFEB3B", "#000000"),
-    "Red": ("#F44336", "#FFFFFF"), "Green": ("#4CAF50", "#FFFFFF"),
-    "Blue": ("#2196F3", "#FFFFFF"), "Orange": ("#FF9800", "#000000"),
-    "Lavender": ("#9575CD", "#FFFFFF"), "Purple": ("#9C27B0", "#FFFFFF"),
-    "Teal": ("#009688", "#FFFFFF"),
-}
-GO_DURATION_MS = 5000
-
-try:
-    import paho.mqtt.client as mqtt
-    MQTT_AVAILABLE = True
-except ImportError:
-    print("paho-mqtt library not found. Please install: pip install paho-mqtt")
-    MQTT_AVAILABLE = False
-
-try:
-    from zeroconf import ServiceInfo, Zeroconf, ServiceBrowser, ServiceStateChange, BadTypeInNameException
-    ZEROCONF_AVAILABLE = True
-except ImportError:
-    print("zeroconf library not found. Please install: pip install zeroconf")
-    ZEROCONF_AVAILABLE = False
-
-# =============================================================================
-# --- SHARED MQTT WORKER ---
-# =============================================================================
-class MqttWorker(QObject):
-    connection_status = Signal(bool)
-    message_received = Signal(str, str)
-
-    def __init__(self, broker, port, topics_to_subscribe=None):
-        super().__init__()
-        self.client = None
-        self.broker = broker
-        self.port = port
-        self.topics = topics_to_subscribe or []
-
-    @Slot()
-    def run(self):
-        if not MQTT_AVAILABLE or not self.broker: return
-        self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
-        self.client.on_connect = self.on_connect
-        self.client.on_disconnect = self.on_disconnect
-        self.client.on_message = self.on_message
-        try:
-            self.client.connect(self.broker, self.port, 60)
-            self.client.loop_forever()
-        except Exception as e:
-            print(f"MQTT Worker: Could not connect to {self.broker}. {e}")
-            self.connection_status.emit(False)
-
-    def on_connect(self, client, userdata, flags, reason_code, properties):
-        if reason_code == 0:
-            print("MQTT Worker: Connected.")
-            self.connection_status.emit(True)
-            if self.topics:
-                for topic in self.topics:
-                    if topic: client.subscribe(topic); print(f"Subscribed to {topic}")
-        else:
-            print(f"MQTT Worker: Failed to connect, code {reason_code}"); self.connection_status.emit(False)
-    
-    def on_disconnect(self, client, userdata, disconnect_flags, reason_code, properties):
-        print(f"MQTT Worker: Disconnected with reason code: {reason_code}"); self.connection_status.emit(False)
-    
-    def on_message(self, client, userdata, msg):
-        self.message_received.emit(msg.topic, msg.payload.decode())
-    
-    @Slot(str, str)
-    def publish(self, topic, payload):
-        if self.client and self.client.is_connected():
-            self.client.publish(topic, payload)
-
-    @Slot(list)
-    def update_subscriptions(self, topics):
-        if self.client and self.client.is_connected():
-            if self.topics:
-                for old_topic in self.topics:
-                    if old_topic: self.client.unsubscribe(old_topic)
-            for new_topic in topics:
-                if new_topic: self.client.subscribe(new_topic)
-        self.topics = topics
-
-    @Slot()
-    def stop(self):
-        if self.client: self.client.loop_stop(); self.client.disconnect()
-
-# =============================================================================
-# --- FORWARD DECLARATIONS and GLOBAL WIDGETS ---
-# =============================================================================
-class TransmitterWindow(QMainWindow): pass
-class ReceiverWindow(QMainWindow): pass
-class ReceiverSettingsDialog(QDialog): pass
-
-class ChannelColumnWidget(QFrame):
-    status_change_requested = Signal(int, str)
-
-    def __init__(self, numeric_id, parent=None):
-        super().__init__(parent)
-        self.numeric_id = numeric_id
-        self.current_status = "idle"
-        
-        self.countdown_timer = QTimer(self)
-        self.countdown_timer.timeout.connect(self._update_countdown_display)
-        self.countdown_seconds = 0
-        
-        self._init_ui()
-
-    def _init_ui(self):
-        self.setFrameShape(QFrame.Shape.StyledPanel); self.setFrameShadow(QFrame.Shadow.Raised)
-        self.setStyleSheet("QFrame { border: 2px solid gray; border-radius: 5px; background-color: rgba(52, 73, 94, 0.5); } QLabel { background: transparent; }")
-        layout = QVBoxLayout(self)
-        
-        self.name_label = QLabel(f"Channel {self.numeric_id}"); font = self.name_label.font(); font.setBold(True); font.setPointSize(12); self.name_label.setFont(font); layout.addWidget(self.name_label, alignment=Qt.AlignCenter)
-        
-        # New label for Cue Info
-        self.cue_info_label = QLabel(""); self.cue_info_label.setStyleSheet("font-size: 9pt; font-style: italic; color: #ecf0f1;"); self.cue_info_label.setAlignment(Qt.AlignCenter); layout.addWidget(self.cue_info_label)
-
-        self.status_label = QLabel("IDLE"); self.status_label.setAlignment(Qt.AlignCenter); self.status_label.setAutoFillBackground(True); self.status_label.setMinimumHeight(30); font = self.status_label.font(); font.setPointSize(11); font.setBold(True); self.status_label.setFont(font); layout.addWidget(self.status_label)
-        
-        self.btn_master_sb = QPushButton("Master Standby"); self.btn_solo_op = QPushButton("Solo Standby")
-        self.btn_master_sb.clicked.connect(self.master_sb_clicked); self.btn_solo_op.clicked.connect(self.solo_op_clicked)
-        layout.addWidget(self.btn_master_sb); layout.addWidget(self.btn_solo_op)
-        
-        subs_header = QLabel("Confirmed Subscribers:"); subs_header.setStyleSheet("font-size: 8pt; color: #bdc3c7;")
-        layout.addWidget(subs_header)
-        
-        self.subscribers_list = QListWidget()
-        self.subscribers_list.setStyleSheet("background-color: #2c3e50; border: 1px solid #7f8c8d;")
-        layout.addWidget(self.subscribers_list, 1)
-
-    def master_sb_clicked(self):
-        if self.current_status == "standby_master": self.status_change_requested.emit(self.numeric_id, "idle")
-        else: self.status_change_requested.emit(self.numeric_id, "standby_master")
-
-    def solo_op_clicked(self):
-        if self.current_status == "standby_solo": self.status_change_requested.emit(self.numeric_id, "go")
-        else: self.status_change_requested.emit(self.numeric_id, "standby_solo")
-
-    @Slot(dict)
-    def update_display(self, data):
-        self.current_status = data.get("status", "idle")
-        label = data.get("label", f"Ch {self.numeric_id}")[:12]
-        color_hex = data.get("colorHex", "#CCCCCC")
-        text_color_hex = data.get("textColorHex", "#000000")
-        confirmed_subscribers = data.get("confirmed_subscribers", [])
-        cue_label = data.get("cueLabel", "")
-
-        self.name_label.setText(label); self.name_label.setStyleSheet(f"color: {color_hex}; font-weight: bold;")
-        self.setStyleSheet(f"QFrame {{ border: 2px solid {color_hex}; border-radius: 5px; background-color: rgba(52, 73, 94, 0.5); }} QLabel {{ background: transparent; }}")
-        
-        self.subscribers_list.clear()
-        for sub_name in confirmed_subscribers:
-            item = QListWidgetItem(sub_name); item.setForeground(QColor(color_hex)); font = item.font(); font.setBold(True); item.setFont(font); self.subscribers_list.addItem(item)
-        
-        self.btn_master_sb.setText("Master Standby"); self.btn_master_sb.setStyleSheet("background-color: #555; border: 2px outset #E74C3C;")
-        self.btn_solo_op.setText("Solo Standby"); self.btn_solo_op.setStyleSheet("background-color: #555; border: 2px outset #E74C3C;")
-        
-        if self.current_status == "standby_master": self.btn_master_sb.setStyleSheet(f"background-color: {color_hex}; color: {text_color_hex}; border: 2px inset black;")
-        elif self.current_status == "standby_solo": self.btn_solo_op.setText("Solo GO"); self.btn_solo_op.setStyleSheet("background-color: #2ECC71; color: black; font-weight: bold;")
-
-        if self.current_status in ["standby_master", "standby_solo", "go"]:
-            self.cue_info_label.setText(cue_label)
-        else:
-            self.cue_info_label.setText("")
-
-        if self.current_status in ["standby_master", "standby_solo"]:
-            self.status_label.setText("STANDBY"); self.status_label.setStyleSheet(f"background-color: {color_hex}; color: {text_color_hex}; border-radius: 3px;"); self.countdown_timer.stop()
-        elif self.current_status == "go":
-            self.countdown_seconds = GO_DURATION_MS // 1000; self.status_label.setText(f"GO! ({self.countdown_seconds})"); self.status_label.setStyleSheet(f"background-color: #E0E0E0; color: black; border-radius: 3px;"); self.countdown_timer.start(1000)
-        else:
-            self.status_label.setText("IDLE"); self.status_label.setStyleSheet("background-color: #7f8c8d; color: white; border-radius: 3px;"); self.countdown_timer.stop()
-
-    def _update_countdown_display(self):
-        self.countdown_seconds -= 1
-        if self.countdown_seconds >= 0:
-            self.status_label.setText(f"GO! ({self.countdown_seconds})")
-        else:
-            self.countdown_timer.stop()
-
-class ChannelConfigWidget(QWidget):
-    config_save_requested = Signal(dict)
-    view_change_requested = Signal(str)
-    def __init__(self, channels_data, parent=None):
-        super().__init__(parent); self.widgets = {}; self._init_ui(); self.update_config(channels_data) 
-    def update_config(self, channels_data):
-        self.temp_channels_data = copy.deepcopy(channels_data)
-        for i, widget_group in self.widgets.items():
-            channel_data = self.temp_channels_data.get(str(i))
-            if channel_data:
-                widget_group["name_edit"].setText(channel_data.get("label"))
-                widget_group["color_combo"].setCurrentText(channel_data.get("colorName"))
-    def _init_ui(self):
-        main_layout = QVBoxLayout(self); header_label = QLabel("Channel Configuration"); font = header_label.font(); font.setPointSize(16); font.setBold(True); header_label.setFont(font); header_label.setAlignment(Qt.AlignCenter)
-        main_layout.addWidget(header_label); grid_container = QWidget(); grid_layout = QGridLayout(grid_container)
-        for i in range(1, 9):
-            label_label = QLabel(f"Channel {i} Label:"); name_edit = QLineEdit(); name_edit.setMaxLength(12); color_label = QLabel("Color:"); color_combo = QComboBox()
-            for color_name in COLOR_OPTIONS_PY.keys(): color_combo.addItem(color_name)
-            self.widgets[i] = {"name_edit": name_edit, "color_combo": color_combo}; grid_layout.addWidget(label_label, i-1, 0); grid_layout.addWidget(name_edit, i-1, 1); grid_layout.addWidget(color_label, i-1, 2); grid_layout.addWidget(color_combo, i-1, 3)
-        main_layout.addWidget(grid_container); main_layout.addStretch(); button_layout = QHBoxLayout(); button_layout.addStretch()
-        cancel_button = QPushButton("Cancel"); cancel_button.clicked.connect(lambda: self.view_change_requested.emit("manual"))
-        save_button = QPushButton("Apply and Return"); save_button.setStyleSheet("background-color: #27ae60; font-weight: bold;"); save_button.clicked.connect(self.save_changes)
-        button_layout.addWidget(cancel_button); button_layout.addWidget(save_button); main_layout.addLayout(button_layout)
-    def save_changes(self):
-        for i, widget_group in self.widgets.items():
-            new_label = widget_group["name_edit"].text(); new_color_name = widget_group["color_combo"].currentText(); new_color_hex, new_text_color_hex = COLOR_OPTIONS_PY[new_color_name]
-            self.temp_channels_data[str(i)]["label"] = new_label; self.temp_channels_data[str(i)]["colorName"] = new_color_name; self.temp_channels_data[str(i)]["colorHex"] = new_color_hex; self.temp_channels_data[str(i)]["textColorHex"] = new_text_color_hex
-        self.config_save_requested.emit(self.temp_channels_data)
-
-class CueEditDialog(QDialog):
-    def __init__(self, cue_data, all_channels_data, parent=None):
-        super().__init__(parent); self.is_new_cue = cue_data is None; self.cue_data = cue_data if cue_data else {"cueNumber": "", "label": "", "channelsInCue": []}
-        self.all_channels_data = all_channels_data; self.setWindowTitle("Edit Cue" if not self.is_new_cue else "Add New Cue"); self.setMinimumWidth(400); self.checkboxes = {}; self._init_ui()
-    def _init_ui(self):
-        layout = QVBoxLayout(self); grid_layout = QGridLayout(); grid_layout.addWidget(QLabel("Cue Number:"), 0, 0); self.num_edit = QLineEdit(str(self.cue_data.get("cueNumber", ""))); grid_layout.addWidget(self.num_edit, 0, 1); grid_layout.addWidget(QLabel("Cue Label:"), 1, 0); self.label_edit = QLineEdit(self.cue_data.get("label", "")); self.label_edit.setMaxLength(30); grid_layout.addWidget(self.label_edit, 1, 1); layout.addLayout(grid_layout)
-        channels_group = QGroupBox("Channels in Cue"); channels_layout = QGridLayout(channels_group)
-        for i in range(1, 9):
-            ch_data = self.all_channels_data.get(str(i));
-            if not ch_data: continue
-            checkbox = QCheckBox(f"{i}: {ch_data.get('label')}"); 
-            if i in self.cue_data.get("channelsInCue", []): checkbox.setChecked(True)
-            self.checkboxes[i] = checkbox; row, col = divmod(i - 1, 4); channels_layout.addWidget(checkbox, row, col)
-        layout.addWidget(channels_group); self.button_box = QDialogButtonBox(); save_btn = self.button_box.addButton("Save Cue", QDialogButtonBox.ButtonRole.AcceptRole); cancel_btn = self.button_box.addButton("Cancel", QDialogButtonBox.ButtonRole.RejectRole)
-        if not self.is_new_cue: delete_btn = self.button_box.addButton("Delete Cue", QDialogButtonBox.ButtonRole.DestructiveRole); delete_btn.setStyleSheet("background-color: #c0392b;"); delete_btn.clicked.connect(self.on_delete)
-        save_btn.clicked.connect(self.on_save); cancel_btn.clicked.connect(self.reject); layout.addWidget(self.button_box)
-    def on_save(self):
-        try: cue_num_float = float(self.num_edit.text())
-        except ValueError: QMessageBox.warning(self, "Invalid Input", "Cue Number must be a valid number."); return
-        selected_channels = [i for i, checkbox in self.checkboxes.items() if checkbox.isChecked()]
-        self.cue_data['cueNumber'] = self.num_edit.text(); self.cue_data['cueNumberFloat'] = cue_num_float; self.cue_data['label'] = self.label_edit.text(); self.cue_data['channelsInCue'] = selected_channels
-        if 'id' not in self.cue_data: self.cue_data['id'] = uuid.uuid4().hex
-        self.accept()
-    def on_delete(self):
-        if QMessageBox.question(self, "Delete Cue", f"Are you sure you want to delete Cue {self.cue_data.get('cueNumber')}?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes: self.done(QDialog.DialogCode.DestructiveRole)
-    def get_data(self): return self.cue_data
-
-class CueStatusDisplay(QFrame):
-    def __init__(self, channels_data, parent=None):
-        super().__init__(parent); self.labels = {}; self.setFrameShape(QFrame.Shape.StyledPanel); self.setStyleSheet("QFrame { border: 1px solid #7f8c8d; }"); self._init_ui(channels_data)
-    def _init_ui(self, channels_data):
-        layout = QGridLayout(self)
-        for i in range(1, 9): label = QLabel(f"Ch {i}: IDLE"); label.setAlignment(Qt.AlignCenter); label.setAutoFillBackground(True); label.setMinimumHeight(25); self.labels[i] = label; row, col = divmod(i - 1, 4); layout.addWidget(label, row, col)
-        self.update_all(channels_data)
-    @Slot(dict)
-    def update_all(self, channels_data):
-        for i_str, data in channels_data.items():
-            if i_str.isdigit(): self.update_single(int(i_str), data)
-    @Slot(int, dict)
-    def update_single(self, channel_id, data):
-        if channel_id not in self.labels: return
-        label_widget = self.labels[channel_id]; status = data.get("status", "idle"); label = data.get("label", f"Ch {channel_id}")[:12]; color_hex = data.get("colorHex", "#CCCCCC"); text_color_hex = data.get("textColorHex", "#000000")
-        status_text = "STANDBY" if "standby" in status else status.upper(); label_widget.setText(f"{label}: {status_text}")
-        bg_hex = "#7f8c8d"; text_hex = "#FFFFFF"
-        if "standby" in status: bg_hex, text_hex = color_hex, text_color_hex
-        elif status == "go": bg_hex, text_hex = "#E0E0E0", "#000000"
-        label_widget.setStyleSheet(f"background-color: {bg_hex}; color: {text_hex}; border: 1px solid black; border-radius: 3px;")
-
-class CueListWidget(QWidget):
-    cue_action_requested = Signal(str, object)
-    def __init__(self, cues_data, channels_data, parent=None):
-        super().__init__(parent); self.channels_data = channels_data; self._init_ui(); self.update_cues(cues_data)
-    def _init_ui(self):
-        layout = QVBoxLayout(self); self.status_display = CueStatusDisplay(self.channels_data); layout.addWidget(self.status_display)
-        header_layout = QHBoxLayout(); header_label = QLabel("Cue List"); font = header_label.font(); font.setPointSize(16); font.setBold(True); header_label.setFont(font)
-        header_layout.addWidget(header_label); header_layout.addStretch(); add_cue_btn = QPushButton("Add New Cue"); add_cue_btn.clicked.connect(self.add_new_cue); header_layout.addWidget(add_cue_btn); layout.addLayout(header_layout)
-        self.table = QTableWidget(); self.table.setColumnCount(4); self.table.setHorizontalHeaderLabels(["Cue", "Label", "Channels", "Actions"]); self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch); self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive); self.table.setSortingEnabled(True); layout.addWidget(self.table)
-    def update_cues(self, cues_data): self.cues_data = cues_data; self.populate_table()
-    def populate_table(self):
-        self.cues_data.sort(key=lambda x: float(x.get('cueNumberFloat', x.get('cueNumber', 0))))
-        self.table.setRowCount(len(self.cues_data))
-        for row, cue in enumerate(self.cues_data):
-            cue_num_item = QTableWidgetItem(); cue_num_item.setData(Qt.ItemDataRole.DisplayRole, cue.get('cueNumber')); cue_num_item.setData(Qt.ItemDataRole.UserRole, float(cue.get('cueNumberFloat', 0)))
-            self.table.setItem(row, 0, cue_num_item); self.table.setItem(row, 1, QTableWidgetItem(cue.get('label'))); self.table.setItem(row, 2, QTableWidgetItem(", ".join(map(str, cue.get("channelsInCue", [])))))
-            edit_btn = QPushButton("Edit"); edit_btn.clicked.connect(lambda checked, c=cue: self.edit_cue(c)); self.table.setCellWidget(row, 3, edit_btn)
-        self.table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
-    def add_new_cue(self): self.cue_action_requested.emit("add", None)
-    def edit_cue(self, cue_data): self.cue_action_requested.emit("edit", cue_data)
-
-# ... (ReceiverWindow implementation follows)
-
-class TransmitterWindow(QMainWindow):
-    def __init__(self):
-        super().__init__(); self.setWindowTitle("Cue Light Transmitter (Offline Mode)"); self.setGeometry(0, 0, 800, 480); self.setStyleSheet("background-color: #2c3e50; color: white;")
-        self.channels_data = {}; self.cues = []; self.current_show_filepath = DEFAULT_SHOW_FILE; self.transmitter_id = f"tx_{uuid.uuid4().hex[:8]}"; self.pending_requests = {}; self.current_cue_index = -1; self.is_current_cue_armed = False
-        self.setup_mqtt(); self._init_ui(); self.handle_startup_choice()
-    def _init_ui(self):
-        self.main_widget = QWidget(); main_layout = QVBoxLayout(self.main_widget); self.setCentralWidget(self.main_widget); self._create_menus()
-        self.top_nav_widget = self.create_top_nav(); main_layout.addWidget(self.top_nav_widget)
-        self.header_widget = self.create_header(); main_layout.addWidget(self.header_widget)
-        self.content_stack = QStackedWidget(); main_layout.addWidget(self.content_stack)
-        self.manual_view_widget = self.create_manual_view(); self.cues_view_widget = CueListWidget(self.cues, self.channels_data); self.channel_config_widget = ChannelConfigWidget(self.channels_data)
-        self.content_stack.addWidget(self.manual_view_widget); self.content_stack.addWidget(self.cues_view_widget); self.content_stack.addWidget(self.channel_config_widget)
-        self.cues_view_widget.cue_action_requested.connect(self.handle_cue_action); self.channel_config_widget.config_save_requested.connect(self.on_config_saved); self.channel_config_widget.view_change_requested.connect(self.show_manual_view)
-        self.show_manual_view()
-    def _create_menus(self):
-        menu_bar = self.menuBar(); file_menu = menu_bar.addMenu("&File"); new_action = QAction("&New Show", self); new_action.triggered.connect(self.handle_new_config); file_menu.addAction(new_action); load_action = QAction("&Load Show...", self); load_action.triggered.connect(self.handle_load_config); file_menu.addAction(load_action); save_action = QAction("&Save Show", self); save_action.triggered.connect(lambda: self.save_config()); file_menu.addAction(save_action); save_as_action = QAction("&Save Show As...", self); save_as_action.triggered.connect(self.handle_save_config_as); file_menu.addAction(save_as_action); file_menu.addSeparator(); exit_action = QAction("&Exit", self); exit_action.triggered.connect(self.close); file_menu.addAction(exit_action)
-    def handle_startup_choice(self):
-        msg_box = QMessageBox(self); msg_box.setWindowTitle("Welcome"); msg_box.setText("Start a new show, load a show, or continue where you left off?"); btn_new = msg_box.addButton("New Show", QMessageBox.ButtonRole.ActionRole); btn_load = msg_box.addButton("Load Show...", QMessageBox.ButtonRole.ActionRole); btn_continue = msg_box.addButton("Continue Last Session", QMessageBox.ButtonRole.AcceptRole); msg_box.exec()
-        if msg_box.clickedButton() == btn_new: self.handle_new_config()
-        elif msg_box.clickedButton() == btn_load: self.handle_load_config()
-        else: self.load_config(DEFAULT_SHOW_FILE)
-    def create_top_nav(self):
-        nav_widget = QFrame(); nav_layout = QHBoxLayout(nav_widget); nav_widget.setStyleSheet("background-color: #34495e;"); nav_layout.setContentsMargins(5,2,5,2)
-        self.btn_manual_mode = QPushButton("Manual"); self.btn_cues_mode = QPushButton("Cues"); self.btn_channel_config = QPushButton("Channel Config")
-        self.nav_buttons = [self.btn_manual_mode, self.btn_cues_mode, self.btn_channel_config]
-        for btn in self.nav_buttons: btn.setCheckable(True); nav_layout.addWidget(btn)
-        self.btn_manual_mode.clicked.connect(self.show_manual_view); self.btn_cues_mode.clicked.connect(self.show_cues_view); self.btn_channel_config.clicked.connect(self.show_channel_config_view)
-        return nav_widget
-    def create_header(self):
-        header_widget = QFrame(); header_layout = QHBoxLayout(header_widget); header_widget.setStyleSheet("background-color: #333; padding: 5px;");
-        self.mqtt_status_label = QLabel("MQTT: Disconnected"); header_layout.addWidget(self.mqtt_status_label); header_layout.addStretch()
-        self.header_controls_widget = QWidget(); controls_layout = QHBoxLayout(self.header_controls_widget); controls_layout.setContentsMargins(0,0,0,0)
-        self.master_go_button = QPushButton("MASTER GO"); self.master_go_button.setStyleSheet("background-color: #4CAF50; color: white; font-size: 14pt; font-weight: bold; padding: 8px;"); self.master_go_button.clicked.connect(self.fire_master_go)
-        controls_layout.addWidget(self.master_go_button); separator = QFrame(); separator.setFrameShape(QFrame.Shape.VLine); separator.setFrameShadow(QFrame.Shadow.Sunken); controls_layout.addWidget(separator)
-        self.cue_controls_widget = self.create_cue_controls(); controls_layout.addWidget(self.cue_controls_widget); header_layout.addWidget(self.header_controls_widget)
-        return header_widget
-    def create_cue_controls(self):
-        widget = QWidget(); layout = QHBoxLayout(widget); layout.setContentsMargins(0,0,0,0)
-        self.btn_prev_cue = QPushButton("<< Prev"); self.btn_prev_cue.clicked.connect(self.prev_cue); layout.addWidget(self.btn_prev_cue)
-        self.cue_standby_label = QLabel("Standby Cue: --"); self.cue_standby_label.setStyleSheet("color: #ecf0f1; font-size: 12pt;"); layout.addWidget(self.cue_standby_label)
-        self.btn_arm_cue = QPushButton("ARM CUE"); self.btn_arm_cue.setStyleSheet("background-color: #f39c12;"); self.btn_arm_cue.clicked.connect(self.arm_current_cue); layout.addWidget(self.btn_arm_cue)
-        self.btn_go_cue = QPushButton("GO CUE"); self.btn_go_cue.setStyleSheet("background-color: #e74c3c; color: white; font-weight: bold;"); self.btn_go_cue.clicked.connect(self.go_current_cue); layout.addWidget(self.btn_go_cue)
-        self.btn_next_cue = QPushButton("Next >>"); self.btn_next_cue.clicked.connect(self.next_cue); layout.addWidget(self.btn_next_cue)
-        return widget
-    def setup_mqtt(self):
-        confirmation_topic = f"{MQTT_APP_ID}/confirmations/{self.transmitter_id}"; self.mqtt_thread = QThread(); self.mqtt_worker = MqttWorker(MQTT_BROKER, MQTT_PORT, [confirmation_topic]); self.mqtt_worker.moveToThread(self.mqtt_thread)
-        self.mqtt_thread.started.connect(self.mqtt_worker.run); self.mqtt_worker.connection_status.connect(self.update_mqtt_status_indicator); self.mqtt_worker.message_received.connect(self.on_confirmation_received); self.mqtt_thread.start()
-    def update_mqtt_status_indicator(self, connected): color = "#4CAF50" if connected else "#F44336"; self.mqtt_status_label.setText(f"MQTT: {'Connected' if connected else 'Disconnected'}"); self.mqtt_status_label.setStyleSheet(f"background-color: {color}; color: white; padding: 2px; border-radius: 3px;")
-    @Slot(str, str)
-    def on_confirmation_received(self, topic, payload):
-        try:
-            data = json.loads(payload); request_id = data.get("request_id"); receiver_name = data.get("receiver_name", "Unknown Receiver")
-            if request_id in self.pending_requests:
-                channel_id = self.pending_requests[request_id]
-                if str(channel_id) in self.channels_data:
-                    if 'confirmed_subscribers' not in self.channels_data[str(channel_id)]: self.channels_data[str(channel_id)]['confirmed_subscribers'] = []
-                    if receiver_name not in self.channels_data[str(channel_id)]['confirmed_subscribers']: self.channels_data[str(channel_id)]['confirmed_subscribers'].append(receiver_name)
-                    self.update_all_channel_displays()
-        except json.JSONDecodeError as e: print(f"Error decoding confirmation payload: {e}")
-    def load_config(self, filepath=None):
-        target_file = filepath or DEFAULT_SHOW_FILE
-        if os.path.exists(target_file):
-            try:
-                with open(target_file, 'r') as f: config = json.load(f); self.channels_data = config.get("channels", {}); self.cues = config.get("cues", []); self.current_show_filepath = target_file; print(f"Config loaded from {target_file}")
-            except Exception as e: print(f"Error reading {target_file}: {e}. Starting with defaults."); self.create_default_config()
-        else:
-            self.create_default_config()
-        self.cues.sort(key=lambda x: float(x.get('cueNumberFloat', x.get('cueNumber', 0))))
-        self.current_cue_index = 0 if self.cues else -1
-        for i_str in self.channels_data: self.channels_data[i_str]['status'] = 'idle'; self.channels_data[i_str]['confirmed_subscribers'] = []
-        if hasattr(self, 'channel_widgets'): self.update_all_channel_displays(); self.update_cue_header_display()
-        self.setWindowTitle(f"Transmitter - {os.path.basename(self.current_show_filepath or 'New Show')}")
-    def create_default_config(self):
-        self.channels_data = {};
-        for i in range(1, 9):
-            color_name = list(COLOR_OPTIONS_PY.keys())[i % len(COLOR_OPTIONS_PY)]; bg_hex, text_hex = COLOR_OPTIONS_PY[color_name]
-            self.channels_data[str(i)] = {"id": f"channel_{i}", "numericId": i, "label": f"Channel {i}", "colorName": color_name, "colorHex": bg_hex, "textColorHex": text_hex}
-        self.cues = []; self.current_show_filepath = None; self.current_cue_index = -1
-    def save_config(self, filepath=None):
-        target_file = filepath or self.current_show_filepath
-        if not target_file: self.handle_save_config_as(); return
-        channels_to_save = {k: {k2: v2 for k2, v2 in v.items() if k2 not in ['status', 'confirmed_subscribers']} for k, v in self.channels_data.items()}
-        config_to_save = {"channels": channels_to_save, "cues": self.cues, "transmitter_name": self.channels_data.get('transmitter_name', 'CueLight-TX')}
-        try:
-            with open(target_file, 'w') as f: json.dump(config_to_save, f, indent=4)
-            self.current_show_filepath = target_file; self.setWindowTitle(f"Transmitter - {os.path.basename(self.current_show_filepath)}"); print(f"Configuration saved to {target_file}")
-        except Exception as e: print(f"Error saving config: {e}")
-    def handle_new_config(self): self.create_default_config(); self.update_all_channel_displays(); self.update_cue_header_display(); self.setWindowTitle("Transmitter - New Show*")
-    def handle_save_config_as(self):
-        filepath, _ = QFileDialog.getSaveFileName(self, "Save Show As", "", "Show Files (*.qlx);;All Files (*)");
-        if filepath: self.save_config(filepath)
-    def handle_load_config(self):
-        filepath, _ = QFileDialog.getOpenFileName(self, "Load Show", "", "Show Files (*.qlx);;All Files (*)");
-        if filepath: self.load_config(filepath)
-    def _update_nav_buttons(self, active_button):
-        for btn in self.nav_buttons: btn.setChecked(btn == active_button)
-        is_operational = active_button in [self.btn_manual_mode, self.btn_cues_mode]
-        self.header_controls_widget.setVisible(is_operational)
-    def show_manual_view(self): self._update_nav_buttons(self.btn_manual_mode); self.content_stack.setCurrentWidget(self.manual_view_widget); self.update_all_channel_displays()
-    def show_cues_view(self): self._update_nav_buttons(self.btn_cues_mode); self.cues_view_widget.update_cues(self.cues); self.cues_view_widget.status_display.update_all(self.channels_data); self.content_stack.setCurrentWidget(self.cues_view_widget); self.update_cue_header_display()
-    def show_channel_config_view(self): self._update_nav_buttons(self.btn_channel_config); self.channel_config_widget.update_config(self.channels_data); self.content_stack.setCurrentWidget(self.channel_config_widget)
-    @Slot(dict)
-    def on_config_saved(self, new_channels_data):
-        self.channels_data = new_channels_data; self.save_config()
-        for ch_id_str, ch_data in self.channels_data.items():
-            topic = f"{MQTT_APP_ID}/config/channel/{ch_id_str}"; payload = json.dumps({"label": ch_data['label'], "colorHex": ch_data['colorHex']}); self.mqtt_worker.publish(topic, payload)
-        self.show_manual_view()
-    def create_manual_view(self):
-        widget = QWidget(); layout = QGridLayout(widget); self.channel_widgets = {}
-        for i in range(1, 9):
-            col_widget = ChannelColumnWidget(i); col_widget.status_change_requested.connect(self.handle_status_change); self.channel_widgets[i] = col_widget
-            row, col = divmod(i - 1, 4); layout.addWidget(col_widget, row, col)
-        return widget
-    def update_all_channel_displays(self):
-        for i_str, channel_data in self.channels_data.items():
-            if not i_str.isdigit(): continue
-            i = int(i_str)
-            if i in self.channel_widgets: self.channel_widgets[i].update_display(channel_data)
-        if hasattr(self, 'cues_view_widget'): self.cues_view_widget.status_display.update_all(self.channels_data)
-    @Slot(int, str)
-    def handle_status_change(self, numeric_id, new_status):
-        numeric_id_str = str(numeric_id)
-        if numeric_id_str not in self.channels_data: return
-        
-        old_status = self.channels_data[numeric_id_str].get('status', 'idle')
-        if "standby" in old_status and "standby" not in new_status:
-            requests_to_remove = [req_id for req_id, ch_id in self.pending_requests.items() if ch_id == numeric_id]
-            for req_id in requests_to_remove:
-                del self.pending_requests[req_id]
-
-        self.channels_data[numeric_id_str]['status'] = new_status
-        payload_data = self.channels_data[numeric_id_str].copy()
-        if "standby" in new_status:
-            request_id = uuid.uuid4().hex
-            payload_data["request_id"] = request_id
-            payload_data["response_topic"] = f"{MQTT_APP_ID}/confirmations/{self.transmitter_id}"
-            self.pending_requests[request_id] = numeric_id
-        
-        if self.current_cue_index != -1:
-            payload_data["cueLabel"] = self.cues[self.current_cue_index].get('label', '')
-
-        topic = f"{MQTT_APP_ID}/channel/{numeric_id}/status"
-        self.mqtt_worker.publish(topic, json.dumps(payload_data))
-        self.update_all_channel_displays()
-        if new_status == "go": QTimer.singleShot(GO_DURATION_MS, lambda: self.revert_go_to_idle(numeric_id))
-    def revert_go_to_idle(self, numeric_id):
-        numeric_id_str = str(numeric_id)
-        if self.channels_data.get(numeric_id_str, {}).get('status') == 'go':
-            if 'confirmed_subscribers' in self.channels_data[numeric_id_str]:
-                self.channels_data[numeric_id_str]['confirmed_subscribers'] = []
-            self.handle_status_change(numeric_id, 'idle')
-    def fire_master_go(self):
-        for i_str, data in self.channels_data.items():
-            if data.get('status') == "standby_master": self.handle_status_change(int(i_str), "go")
-    def update_cue_header_display(self):
-        if self.current_cue_index != -1 and self.cues:
-            cue = self.cues[self.current_cue_index]
-            self.cue_standby_label.setText(f"Standby Cue: {cue.get('cueNumber')} - {cue.get('label')}")
-            color = "#f39c12" if not self.is_current_cue_armed else "#7f8c8d"
-            self.btn_arm_cue.setStyleSheet(f"background-color: {color};"); self.btn_arm_cue.setEnabled(not self.is_current_cue_armed); self.btn_go_cue.setEnabled(self.is_current_cue_armed)
-        else:
-            self.cue_standby_label.setText("Standby Cue: --"); self.btn_arm_cue.setEnabled(False); self.btn_go_cue.setEnabled(False)
-    @Slot()
-    def arm_current_cue(self):
-        if self.current_cue_index == -1 or not self.cues: return
-        cue = self.cues[self.current_cue_index]
-        for channel_id in cue.get("channelsInCue", []): self.handle_status_change(channel_id, "standby_master")
-        self.is_current_cue_armed = True; self.update_cue_header_display()
-    @Slot()
-    def go_current_cue(self):
-        if not self.is_current_cue_armed or self.current_cue_index == -1: return
-        cue = self.cues[self.current_cue_index]
-        for channel_id in cue.get("channelsInCue", []): self.handle_status_change(channel_id, "go")
-        self.is_current_cue_armed = False; self.next_cue()
-    @Slot()
-    def next_cue(self):
-        if len(self.cues) == 0: return
-        if self.current_cue_index < len(self.cues) - 1: self.current_cue_index += 1
-        else: self.current_cue_index = 0
-        self.is_current_cue_armed = False; self.update_cue_header_display()
-    @Slot()
-    def prev_cue(self):
-        if len(self.cues) == 0: return
-        if self.current_cue_index > 0: self.current_cue_index -= 1
-        else: self.current_cue_index = len(self.cues) - 1
-        self.is_current_cue_armed = False; self.update_cue_header_display()
-    @Slot(str, object)
-    def handle_cue_action(self, action, data):
-        if action == "add":
-            dialog = CueEditDialog(None, self.channels_data, self)
-            if dialog.exec() == QDialog.DialogCode.Accepted:
-                new_cue = dialog.get_data(); self.cues.append(new_cue); self.save_config(); self.show_cues_view()
-        elif action == "edit":
-            dialog = CueEditDialog(data, self.channels_data, self); result = dialog.exec()
-            if result == QDialog.DialogCode.Accepted:
-                updated_cue = dialog.get_data()
-                for i, cue in enumerate(self.cues):
-                    if cue.get('id') == updated_cue.get('id'): self.cues[i] = updated_cue; break
-                self.save_config(); self.show_cues_view()
-            elif result == QDialog.DialogCode.DestructiveRole:
-                self.cues = [c for c in self.cues if c.get('id') != data.get('id')]; self.save_config(); self.show_cues_view()
-    def closeEvent(self, event):
-        self.save_config(DEFAULT_SHOW_FILE); self.mqtt_worker.stop(); self.mqtt_thread.quit(); self.mqtt_thread.wait(); super().closeEvent(event)
-
-# =============================================================================
-# --- RECEIVER WIDGETS AND WINDOW ---
-# =============================================================================
-class ReceiverSettingsDialog(QDialog):
-    def __init__(self, current_name, current_channel_id, current_broker_ip, parent=None):
-        super().__init__(parent); self.setWindowTitle("Receiver Settings"); layout = QVBoxLayout(self)
-        name_layout = QHBoxLayout(); name_layout.addWidget(QLabel("Receiver Name:")); self.name_edit = QLineEdit(current_name); self.name_edit.setMaxLength(12); name_layout.addWidget(self.name_edit); layout.addLayout(name_layout)
-        channel_layout = QHBoxLayout(); channel_layout.addWidget(QLabel("Subscribe to Channel:")); self.channel_combo = QComboBox(); self.channel_combo.addItems([str(i) for i in range(1, 9)]); self.channel_combo.setCurrentText(str(current_channel_id)); channel_layout.addWidget(self.channel_combo); layout.addLayout(channel_layout)
-        broker_layout = QHBoxLayout(); broker_layout.addWidget(QLabel("Broker IP:")); self.broker_edit = QLineEdit(current_broker_ip); broker_layout.addWidget(self.broker_edit); layout.addLayout(broker_layout)
-        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel); self.button_box.accepted.connect(self.accept); self.button_box.rejected.connect(self.reject); layout.addWidget(self.button_box)
-    def get_settings(self): return {"name": self.name_edit.text(), "channel_id": self.channel_combo.currentText(), "broker_ip": self.broker_edit.text()}
-
-class ReceiverWindow(QMainWindow):
-    def __init__(self):
-        super().__init__(); self.setWindowTitle("Cue Light Receiver"); self.setGeometry(100, 100, 800, 480)
-        self.current_request_id = None; self.current_response_topic = None; self.is_confirmed = False
-        self.broker_ip = "localhost" # Default
-        self.load_settings()
-        self.setup_mqtt()
-        self._init_ui()
-    def load_settings(self):
-        self.receiver_id = self._get_or_create_receiver_id(); self.receiver_name = "Receiver 1"; self.subscribed_channel_id = 1
-        if os.path.exists(RECEIVER_CONFIG_FILE):
-            try:
-                with open(RECEIVER_CONFIG_FILE, "r") as f: config = json.load(f); self.receiver_name = config.get("name", self.receiver_name); self.subscribed_channel_id = config.get("channel_id", self.subscribed_channel_id); self.broker_ip = config.get("broker_ip", "localhost")
-            except Exception as e: print(f"Receiver: Error loading config: {e}")
-        self.setWindowTitle(f"Receiver - {self.receiver_name} on Ch {self.subscribed_channel_id}")
-    def save_settings(self, name, channel_id, broker_ip):
-        self.receiver_name = name; self.subscribed_channel_id = int(channel_id); self.broker_ip = broker_ip
-        with open(RECEIVER_CONFIG_FILE, "w") as f: json.dump({"name": self.receiver_name, "channel_id": self.subscribed_channel_id, "broker_ip": self.broker_ip}, f)
-        new_topics = [f"{MQTT_APP_ID}/channel/{self.subscribed_channel_id}/status", f"{MQTT_APP_ID}/system/cue_info", f"{MQTT_APP_ID}/config/channel/{self.subscribed_channel_id}"]
-        self.mqtt_worker.stop(); self.mqtt_thread.quit(); self.mqtt_thread.wait(); self.setup_mqtt()
-        self.setWindowTitle(f"Receiver - {self.receiver_name} on Ch {self.subscribed_channel_id}")
-    def _get_or_create_receiver_id(self):
-        try:
-            with open("receiver_id.txt", "r") as f: return f.read().strip()
-        except FileNotFoundError:
-            new_id = str(uuid.uuid4());
-            with open("receiver_id.txt", "w") as f: f.write(new_id)
-            return new_id
-    def setup_mqtt(self):
-        topics = [f"{MQTT_APP_ID}/channel/{self.subscribed_channel_id}/status", f"{MQTT_APP_ID}/system/cue_info", f"{MQTT_APP_ID}/config/channel/{self.subscribed_channel_id}"]
-        self.mqtt_thread = QThread(); self.mqtt_worker = MqttWorker(self.broker_ip, MQTT_PORT, topics); self.mqtt_worker.moveToThread(self.mqtt_thread)
-        self.mqtt_thread.started.connect(self.mqtt_worker.run); self.mqtt_worker.message_received.connect(self.handle_mqtt_message); self.mqtt_worker.connection_status.connect(self.update_connection_status); self.mqtt_thread.start()
-    def _init_ui(self):
-        self.central_widget = QWidget(); self.setCentralWidget(self.central_widget); self.main_layout = QVBoxLayout(self.central_widget); self.main_layout.setAlignment(Qt.AlignCenter)
-        self.receiver_name_label = QLabel(self.receiver_name); font_receiver_name = self.receiver_name_label.font(); font_receiver_name.setPointSize(24); self.receiver_name_label.setFont(font_receiver_name); self.main_layout.addWidget(self.receiver_name_label)
-        self.cue_info_label = QLabel(""); font_cue_info = self.cue_info_label.font(); font_cue_info.setPointSize(16); self.cue_info_label.setFont(font_cue_info); self.cue_info_label.setAlignment(Qt.AlignCenter); self.cue_info_label.setVisible(False); self.main_layout.addWidget(self.cue_info_label)
-        self.status_label = QLabel("IDLE"); font_status = self.status_label.font(); font_status.setPointSize(72); font_status.setBold(True); self.status_label.setFont(font_status); self.status_label.setAlignment(Qt.AlignCenter); self.status_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding); self.main_layout.addWidget(self.status_label, 1)
-        self.channel_name_label = QLabel(f"Channel {self.subscribed_channel_id}"); font_ch_name = self.channel_name_label.font(); font_ch_name.setPointSize(16); self.channel_name_label.setFont(font_ch_name); self.channel_name_label.setAlignment(Qt.AlignCenter); self.main_layout.addWidget(self.channel_name_label)
-        self.confirm_button = QPushButton("Confirm?"); font_confirm = self.confirm_button.font(); font_confirm.setPointSize(20); font_confirm.setBold(True); self.confirm_button.setFont(font_confirm); self.confirm_button.setMinimumHeight(60); self.confirm_button.clicked.connect(self.handle_confirm_press); self.confirm_button.setVisible(False); self.main_layout.addWidget(self.confirm_button)
-        self.settings_button = QPushButton("⚙️"); self.settings_button.setFixedSize(30, 30); self.settings_button.clicked.connect(self.open_settings_dialog); header_layout = QHBoxLayout(); header_layout.addStretch(1); header_layout.addWidget(self.settings_button); self.main_layout.insertLayout(0, header_layout)
-        self.update_background_and_text()
-    @Slot(str, str)
-    def handle_mqtt_message(self, topic, payload):
-        try: data = json.loads(payload)
-        except json.JSONDecodeError: return
-        if f"/channel/{self.subscribed_channel_id}/status" in topic: self.update_display_from_data(data)
-        elif f"/config/channel/{self.subscribed_channel_id}" in topic: self.channel_name_label.setText(data.get('label', ''))
-    def update_display_from_data(self, data):
-        status = data.get("status", "idle"); bg_hex = "#E0E0E0"; text_hex = "#000000"; show_confirm = False
-        self.current_request_id = None; self.current_response_topic = None; self.is_confirmed = False
-        cue_label = data.get("cueLabel", "")
-        self.cue_info_label.setText(cue_label)
-        self.cue_info_label.setVisible(bool(cue_label))
-
-        if status in ["standby_master", "standby_solo"]: status_text = "STANDBY"; bg_hex = data.get("colorHex", "#E0E0E0"); text_hex = data.get("textColorHex", "#000000"); show_confirm = True; self.current_request_id = data.get("request_id"); self.current_response_topic = data.get("response_topic")
-        elif status == "go": status_text = "GO!"; bg_hex = "#000000"; text_hex = data.get("colorHex", "#FFFFFF")
-        else: status_text = "IDLE"; self.cue_info_label.setVisible(False)
-        self.status_label.setText(status_text); self.channel_name_label.setText(data.get("label", "")); self.update_background_and_text(bg_hex, text_hex); self.confirm_button.setVisible(show_confirm); self.confirm_button.setEnabled(True); self.confirm_button.setText("Confirm?")
-    def handle_confirm_press(self):
-        if self.current_response_topic and self.current_request_id and not self.is_confirmed:
-            payload = json.dumps({"request_id": self.current_request_id, "receiver_id": self.receiver_id, "receiver_name": self.receiver_name})
-            self.mqtt_worker.publish(self.current_response_topic, payload)
-            self.is_confirmed = True; self.confirm_button.setText("CONFIRMED!"); self.confirm_button.setEnabled(False); self.confirm_button.setStyleSheet("background-color: #4CAF50; color: white;")
-    def update_background_and_text(self, bg_color_hex="#E0E0E0", text_color_hex="#000000"):
-        pal = self.central_widget.palette(); pal.setColor(QPalette.ColorRole.Window, QColor(bg_color_hex)); self.central_widget.setAutoFillBackground(True); self.central_widget.setPalette(pal)
-        style_str = f"color: {text_color_hex};"; self.status_label.setStyleSheet(style_str); self.channel_name_label.setStyleSheet(style_str); self.cue_info_label.setStyleSheet(style_str)
-    def update_connection_status(self, connected):
-        if not connected: self.update_background_and_text("#505050"); self.status_label.setText("DISCONNECTED")
-    def open_settings_dialog(self):
-        dialog = ReceiverSettingsDialog(self.receiver_name, self.subscribed_channel_id, self.broker_ip, self)
-        if dialog.exec(): settings = dialog.get_settings(); self.save_settings(settings["name"], settings["channel_id"], settings["broker_ip"])
-    def closeEvent(self, event): self.mqtt_worker.stop(); self.mqtt_thread.quit(); self.mqtt_thread.wait(); super().closeEvent(event)
-
-# =============================================================================
-# --- UNIFIED STARTUP ---
-# =============================================================================
-def get_device_role():
-    if os.path.exists(ROLE_CONFIG_FILE):
-        try:
-            with open(ROLE_CONFIG_FILE, 'r') as f: return json.load(f).get("role", "receiver").lower()
-        except Exception as e: print(f"Error reading role config: {e}. Defaulting to receiver.")
-    return "receiver"
-
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion")
-    
-    role = get_device_role()
-    print(f"Device role detected: '{role}'")
-    
-    if role == "transmitter":
-        window = TransmitterWindow()
-    else:
-        window = ReceiverWindow()
-        
-    window.show()
-    if '--fullscreen' in sys.argv:
-        window.showFullScreen()
-    
-    sys.exit(app.exec())
+import sys
+import json
+import time
+import os
+import uuid
+import socket
+import bisect
+import collections
+import heapq
+import functools
+from contextlib import contextmanager
+import mmap
+import types
+import logging
+from PySide6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QGridLayout, QFrame, QDialog, QLineEdit,
+    QDialogButtonBox, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox,
+    QFileDialog, QSizePolicy, QListWidget, QListWidgetItem, QGroupBox,
+    QRadioButton, QComboBox, QMessageBox, QMenu, QStackedWidget
+)
+from PySide6.QtCore import Qt, Slot, Signal, QTimer, QObject, QThread, QEventLoop, QRunnable, QThreadPool
+from PySide6.QtGui import QPalette, QColor, QFont, QAction
+
+# =============================================================================
+# --- GLOBAL CONFIGURATION ---
+# =============================================================================
+MQTT_BROKER = "localhost" # Default for transmitter, receiver will load from config
+MQTT_PORT = 1883
+MQTT_APP_ID = "cuelight_system"
+ZEROCONF_SERVICE_TYPE = "_cuelight-mqtt._tcp.local."
+
+ROLE_CONFIG_FILE = "device_role.json"
+RECEIVER_CONFIG_FILE = "receiver_config.json"
+DEFAULT_SHOW_FILE = "last_show.qlx"
+APP_STYLESHEET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "cuelight.qss")
+
+COLOR_OPTIONS_PY = { 
+    "White": ("#FFFFFF", "#000000"), "Cyan": ("#00BCD4", "#000000"),
+    "Magenta": ("#E91E63", "#FFFFFF"), "Yellow": ("#FFEB3B", "#000000"),
+    "Red": ("#F44336", "#FFFFFF"), "Green": ("#4CAF50", "#FFFFFF"),
+    "Blue": ("#2196F3", "#FFFFFF"), "Orange": ("#FF9800", "#000000"),
+    "Lavender": ("#9575CD", "#FFFFFF"), "Purple": ("#9C27B0", "#FFFFFF"),
+    "Teal": ("#009688", "#FFFFFF"),
+}
+# Hex strings parsed into QColor once at import; read-only so widgets can
+# share the instances instead of re-parsing "#RRGGBB" on every repaint.
+COLOR_OBJECTS = types.MappingProxyType({
+    name: (QColor(bg), QColor(fg)) for name, (bg, fg) in COLOR_OPTIONS_PY.items()
+})
+COLOR_OPTIONS_NAMES = tuple(COLOR_OPTIONS_PY.keys())
+# QColor instances by hex string, seeded from the palette; arbitrary hexes
+# from the wire are parsed once and cached on first use.
+_COLOR_CACHE = {}
+for _name, (_bg_hex, _fg_hex) in COLOR_OPTIONS_PY.items():
+    _COLOR_CACHE[_bg_hex], _COLOR_CACHE[_fg_hex] = COLOR_OBJECTS[_name]
+
+def cached_color(hex_str):
+    color = _COLOR_CACHE.get(hex_str)
+    if color is None:
+        color = _COLOR_CACHE[hex_str] = QColor(hex_str)
+    return color
+
+@functools.lru_cache(maxsize=64)
+def _make_palette(bg_hex):
+    # QPalette assignment is copy-on-write, so sharing cached instances
+    # across status flips is safe and skips the hex re-parse.
+    pal = QPalette(); pal.setColor(QPalette.ColorRole.Window, cached_color(bg_hex)); return pal
+
+@functools.lru_cache(maxsize=64)
+def _fg_style(text_hex): return f"color: {text_hex};"
+
+@functools.lru_cache(maxsize=256)
+def _text_for_bg(bg_hex):
+    # Contrast fallback for payloads that carry a background but no text
+    # color; cached so the luminance math runs once per distinct hex.
+    try: r, g, b = int(bg_hex[1:3], 16), int(bg_hex[3:5], 16), int(bg_hex[5:7], 16)
+    except ValueError: return "#000000"
+    return "#000000" if (0.299 * r + 0.587 * g + 0.114 * b) > 140 else "#FFFFFF"
+GO_DURATION_MS = 5000
+
+# Channel-colored stylesheet strings are memoized here: Qt re-parses and
+# re-polishes on every setStyleSheet call, so identical strings should only
+# be built once and only applied when something actually changed.
+_QSS_TEMPLATES = {
+    "frame": "QFrame {{ border: 2px solid {bg}; border-radius: 5px; background-color: rgba(52, 73, 94, 0.5); }} QLabel {{ background: transparent; }}",
+    "name": "color: {bg}; font-weight: bold;",
+    "btn_standby": "background-color: {bg}; color: {fg}; border: 2px inset black;",
+    "status_standby": "background-color: {bg}; color: {fg}; border-radius: 3px;",
+    "cue_status": "background-color: {bg}; color: {fg}; border: 1px solid black; border-radius: 3px;",
+}
+_QSS_CACHE = {}
+
+def channel_qss(role, bg="", fg=""):
+    key = (role, bg, fg)
+    qss = _QSS_CACHE.get(key)
+    if qss is None:
+        qss = _QSS_CACHE[key] = _QSS_TEMPLATES[role].format(bg=bg, fg=fg)
+    return qss
+
+def prewarm_channel_qss():
+    # Every runtime color comes from COLOR_OPTIONS_PY, so the full finite set
+    # of stylesheets the channel widgets can request is rendered up front and
+    # later channel_qss calls are plain dict hits. The argument shapes mirror
+    # the call sites (frame/name take only a background).
+    for bg, fg in COLOR_OPTIONS_PY.values():
+        channel_qss("frame", bg); channel_qss("name", bg)
+        channel_qss("btn_standby", bg, fg); channel_qss("status_standby", bg, fg); channel_qss("cue_status", bg, fg)
+
+# QoS policy per topic family (second path segment). Transient cue state is
+# fire-and-forget; config is retained at QoS 1 so late-joining receivers
+# pick it up. Callers look their topic up here before publishing.
+TOPIC_QOS = {
+    "channel": (0, False),
+    "confirmations": (0, False),
+    "system": (0, False),
+    "config": (1, True),
+}
+
+def qos_for_topic(topic):
+    parts = topic.split("/")
+    return TOPIC_QOS.get(parts[1] if len(parts) > 1 else "", (0, False))
+
+def cue_sort_key(cue):
+    return float(cue.get('cueNumberFloat', cue.get('cueNumber', 0)))
+
+# Topic carrying several small updates in one payload; subscribers unpack
+# and dispatch each entry to the normal per-topic handler.
+MQTT_BUNDLE_TOPIC = f"{MQTT_APP_ID}/bundle"
+# All channel label/color config in one retained message instead of eight.
+MQTT_CONFIG_BULK_TOPIC = f"{MQTT_APP_ID}/config/channels"
+
+# Group name for MQTT 5 shared subscriptions ($share/<group>/<topic>).
+MQTT_SHARE_GROUP = "cuelight"
+
+def shared_topic(topic):
+    return f"$share/{MQTT_SHARE_GROUP}/{topic}"
+
+def _local_ip():
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            s.connect(("8.8.8.8", 80)); return s.getsockname()[0]
+        finally:
+            s.close()
+    except OSError:
+        return "127.0.0.1"
+
+_SERVICE_INFO = None
+
+def get_service_info():
+    """Build the mDNS ServiceInfo once and reuse it across (re)announces.
+
+    TXT values are pre-encoded bytes — zeroconf skips re-encoding them on
+    every broadcast — and carry selector keys so receivers can filter on
+    role without an extra round trip.
+    """
+    global _SERVICE_INFO
+    if _SERVICE_INFO is None:
+        properties = {b"role": b"tx", b"ver": b"1"}
+        _SERVICE_INFO = ServiceInfo(
+            ZEROCONF_SERVICE_TYPE,
+            f"CueLight Transmitter.{ZEROCONF_SERVICE_TYPE}",
+            addresses=[socket.inet_aton(_local_ip())],
+            port=MQTT_PORT,
+            properties=properties,
+        )
+    return _SERVICE_INFO
+
+try:
+    import paho.mqtt.client as mqtt
+    MQTT_AVAILABLE = True
+except ImportError:
+    print("paho-mqtt library not found. Please install: pip install paho-mqtt")
+    MQTT_AVAILABLE = False
+
+try:
+    from zeroconf import ServiceInfo, Zeroconf, ServiceBrowser, ServiceStateChange, BadTypeInNameException
+    ZEROCONF_AVAILABLE = True
+except ImportError:
+    print("zeroconf library not found. Please install: pip install zeroconf")
+    ZEROCONF_AVAILABLE = False
+
+# orjson is optional but much faster than stdlib json on the MQTT hot path.
+# Both helpers produce/accept bytes so payloads go to paho without an extra
+# encode step.
+try:
+    import orjson
+    def json_dumps(obj): return orjson.dumps(obj)
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj): return json.dumps(obj, separators=(',', ':')).encode()
+    json_loads = json.loads
+
+def _load_json(path):
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+@functools.cache
+def _get_or_create_receiver_id():
+    # The id file never changes during a run; cache so settings round-trips
+    # don't re-read it.
+    try:
+        with open("receiver_id.txt", "r") as f: return f.read().strip()
+    except FileNotFoundError:
+        new_id = str(uuid.uuid4())
+        with open("receiver_id.txt", "w") as f: f.write(new_id)
+        return new_id
+
+class _ShowWriteJob(QRunnable):
+    # Writes pre-serialized show bytes off the GUI thread; temp file plus
+    # os.replace keeps the show file whole if the app dies mid-write.
+    def __init__(self, blob, path):
+        super().__init__(); self.blob = blob; self.path = path
+    def run(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "wb") as f: f.write(self.blob)
+            os.replace(tmp, self.path)
+            print(f"Configuration saved to {self.path}")
+        except Exception as e: print(f"Error saving config: {e}")
+
+def _load_show_file(path):
+    # Big .qlx shows are parsed straight out of an mmap so the whole file is
+    # never duplicated into a Python bytes object first.
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            try: return json_loads(mm)
+            except TypeError: return json_loads(mm[:])  # stdlib json fallback
+        finally:
+            mm.close()
+
+# =============================================================================
+# --- SHARED MQTT WORKER ---
+# =============================================================================
+# Lazy %s formatting keeps the network-thread hot path free of string
+# building (and stdout flushes) unless the level is actually enabled.
+log = logging.getLogger("cuelight.mqtt")
+
+class MqttWorker(QObject):
+    connection_status = Signal(bool)
+    publish_requested = Signal(str, object, int, bool)
+    publish_batch_requested = Signal(list)
+
+    PUBLISH_FLUSH_MS = 5
+    INBOX_DRAIN_MS = 16
+    INBOX_DRAIN_LIMIT = 500
+    RESUBSCRIBE_DEBOUNCE_MS = 100
+
+    def __init__(self, broker, port, topics_to_subscribe=None):
+        super().__init__()
+        self.client = None
+        self.broker = broker
+        self.port = port
+        self.topics = topics_to_subscribe or []
+        self._pending = collections.deque()
+        self._flush_scheduled = False
+        self._connected = False
+        self._event_loop = None
+        self._wanted_topics = None
+        self._resub_scheduled = False
+        # Bound-method caches for the hot paho calls, filled in on_connect.
+        self._publish = None
+        self._subscribe = None
+        self._unsubscribe = None
+        # Queued once moveToThread has run, so publish work (serialization,
+        # queue flush) happens on the worker thread, not the GUI thread.
+        self.publish_requested.connect(self._do_publish)
+        self.publish_batch_requested.connect(self._do_publish_many)
+        # Inbound messages queue here; the owning window drains on a timer.
+        # deque.append is atomic, so no lock is needed between the paho
+        # network thread and the GUI thread.
+        self.inbox = collections.deque()
+
+    @Slot()
+    def run(self):
+        if not MQTT_AVAILABLE or not self.broker: return
+        self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, protocol=mqtt.MQTTv5)
+        self.client.on_connect = self.on_connect
+        self.client.on_disconnect = self.on_disconnect
+        self.client.on_message = self.on_message
+        # Unlimited inflight/queued messages: the default inflight window of
+        # 20 stalls bursts of QoS 1 config publishes behind broker ACKs.
+        self.client.max_inflight_messages_set(0)
+        self.client.max_queued_messages_set(0)
+        self.client.reconnect_delay_set(min_delay=1, max_delay=8)
+        try:
+            self.client.connect(self.broker, self.port, 60)
+        except Exception as e:
+            log.warning("Could not connect to %s: %s", self.broker, e)
+            self.connection_status.emit(False)
+            return
+        # loop_start() gives paho its own network thread; this QThread then
+        # just runs an event loop so queued Slot calls keep being dispatched.
+        # A slow GUI no longer backpressures the socket reads.
+        self.client.loop_start()
+        self._event_loop = QEventLoop()
+        self._event_loop.exec()
+
+    def on_connect(self, client, userdata, flags, reason_code, properties):
+        if reason_code == 0:
+            log.info("Connected to %s", self.broker)
+            self._publish = client.publish; self._subscribe = client.subscribe; self._unsubscribe = client.unsubscribe
+            self._connected = True
+            self._tune_socket()
+            self.connection_status.emit(True)
+            if self.topics:
+                for topic in self.topics:
+                    if topic: client.subscribe(topic); log.debug("Subscribed to %s", topic)
+        else:
+            log.warning("Failed to connect, code %s", reason_code); self.connection_status.emit(False)
+    
+    def _tune_socket(self):
+        # Disable Nagle so small GO/standby frames go out immediately instead
+        # of sitting in the coalescing window, and widen the send buffer for
+        # bursty cue storms.
+        sock = self.client.socket()
+        if sock is None: return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        except OSError as e:
+            log.warning("Could not tune socket: %s", e)
+
+    def on_disconnect(self, client, userdata, disconnect_flags, reason_code, properties):
+        log.info("Disconnected with reason code: %s", reason_code); self._connected = False; self.connection_status.emit(False)
+    
+    def on_message(self, client, userdata, msg):
+        # Queue the raw bytes for the GUI-side drain timer; decoding is
+        # deferred to the handler that parses them (json_loads takes bytes
+        # directly). Avoids a cross-thread Qt signal per message.
+        self.inbox.append((msg.topic, msg.payload))
+
+    def drain_inbox(self, handler):
+        """Called from the owning window's drain timer; hands up to
+        INBOX_DRAIN_LIMIT queued messages to handler(topic, payload). Topic
+        routing is the window's business (the receiver keeps its own
+        exact-topic dispatch table)."""
+        inbox = self.inbox
+        for _ in range(self.INBOX_DRAIN_LIMIT):
+            if not inbox: break
+            topic, payload = inbox.popleft()
+            handler(topic, payload)
+    
+    def publish(self, topic, payload, qos=0, retain=False):
+        # Thread-safe entry point: hands off through a queued signal so the
+        # caller (usually the GUI thread) returns to its event loop at once.
+        self.publish_requested.emit(topic, payload, qos, retain)
+
+    @Slot(str, object, int, bool)
+    def _do_publish(self, topic, payload, qos, retain):
+        # Enqueue and flush shortly after; bursts (master GO, cue fire) coalesce
+        # into one drain so paho only takes its publish lock once per batch.
+        # Dicts/lists are serialized here so callers can skip json.dumps.
+        if isinstance(payload, (dict, list)): payload = json_dumps(payload)
+        self._pending.append((topic, payload, qos, retain))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(self.PUBLISH_FLUSH_MS, lambda: self._flush_pending())
+
+    def _flush_pending(self):
+        self._flush_scheduled = False
+        # _connected is maintained by on_connect/on_disconnect so the hot
+        # path skips paho's per-call is_connected() state check.
+        if not (self._connected and self.client):
+            self._pending.clear(); return
+        # Last-write-wins coalescing is only safe for full-state snapshot
+        # topics (per-channel status, config). Bundles and confirmations each
+        # carry distinct events — dropping an "older" one would lose a whole
+        # batch of reverts or a confirmation — so they all go out as queued.
+        latest = {}; events = []
+        while self._pending:
+            topic, payload, qos, retain = self._pending.popleft()
+            if topic == MQTT_BUNDLE_TOPIC or "/confirmations/" in topic:
+                events.append((topic, payload, qos, retain))
+            else:
+                latest[topic] = (payload, qos, retain)
+        publish = self._publish
+        for topic, payload, qos, retain in events:
+            publish(topic, payload, qos=qos, retain=retain)
+        for topic, (payload, qos, retain) in latest.items():
+            publish(topic, payload, qos=qos, retain=retain)
+
+    def publish_many(self, messages):
+        # One queued hop for a whole cue's worth of (topic, payload) pairs
+        # instead of a signal emission per channel.
+        if messages: self.publish_batch_requested.emit(list(messages))
+
+    @Slot(list)
+    def _do_publish_many(self, messages):
+        # A lone message goes out on its own topic; real batches ship as one
+        # bundle packet that receivers unpack.
+        if len(messages) == 1:
+            topic, payload = messages[0]; self._do_publish(topic, payload, 0, False)
+        else:
+            self.publish_bundle(messages)
+
+    @Slot(list)
+    def publish_bundle(self, updates):
+        # Pack N tiny (topic, payload) updates into one message so a cue that
+        # touches many channels costs one packet instead of N. Entry payloads
+        # are flattened to str so receivers can json_loads each one as if it
+        # had arrived on its own topic.
+        if not updates: return
+        bundle = []
+        for t, p in updates:
+            if isinstance(p, (dict, list)): p = json_dumps(p)
+            if isinstance(p, bytes): p = p.decode()
+            bundle.append({"t": t, "p": p})
+        self.publish(MQTT_BUNDLE_TOPIC, bundle)
+
+    @Slot(list)
+    def update_subscriptions(self, topics):
+        # Debounce so rapid UI churn collapses into one (un)subscribe pass
+        # against the final topic set.
+        self._wanted_topics = topics
+        if not self._resub_scheduled:
+            self._resub_scheduled = True
+            QTimer.singleShot(self.RESUBSCRIBE_DEBOUNCE_MS, lambda: self._apply_subscriptions())
+
+    def _apply_subscriptions(self):
+        self._resub_scheduled = False
+        topics = self._wanted_topics
+        if topics is None: return
+        if self._connected and self.client:
+            old = set(t for t in self.topics if t); new = set(t for t in topics if t)
+            for topic in old - new: self._unsubscribe(topic)
+            for topic in new - old: self._subscribe(topic)
+        self.topics = topics
+
+    @Slot()
+    def stop(self):
+        self._flush_pending()
+        if self.client: self.client.loop_stop(); self.client.disconnect()
+        if self._event_loop: self._event_loop.quit()
+
+# =============================================================================
+# --- FORWARD DECLARATIONS and GLOBAL WIDGETS ---
+# =============================================================================
+class TransmitterWindow(QMainWindow): pass
+class ReceiverWindow(QMainWindow): pass
+class ReceiverSettingsDialog(QDialog): pass
+
+class ChannelColumnWidget(QFrame):
+    status_change_requested = Signal(int, str)
+
+    # Fonts shared by all nine columns; built once after the QApplication
+    # exists instead of per-widget in _init_ui.
+    _SUB_FONT = None; _NAME_FONT = None; _STATUS_FONT = None
+
+    @classmethod
+    def _init_shared_fonts(cls):
+        if cls._SUB_FONT is None:
+            cls._SUB_FONT = QFont(); cls._SUB_FONT.setBold(True)
+            cls._NAME_FONT = QFont(cls._SUB_FONT); cls._NAME_FONT.setPointSize(12)
+            cls._STATUS_FONT = QFont(cls._SUB_FONT); cls._STATUS_FONT.setPointSize(11)
+
+    def __init__(self, numeric_id, parent=None):
+        super().__init__(parent)
+        self.numeric_id = numeric_id
+        self.current_status = "idle"
+        self._last_style_key = None
+        self._sub_names = []
+        self._sub_color = None
+        self._init_shared_fonts()
+
+        self._init_ui()
+
+    def _init_ui(self):
+        self.setFrameShape(QFrame.Shape.StyledPanel); self.setFrameShadow(QFrame.Shadow.Raised)
+        self.setStyleSheet("QFrame { border: 2px solid gray; border-radius: 5px; background-color: rgba(52, 73, 94, 0.5); } QLabel { background: transparent; }")
+        layout = QVBoxLayout(self)
+        
+        self.name_label = QLabel(f"Channel {self.numeric_id}"); self.name_label.setFont(self._NAME_FONT); layout.addWidget(self.name_label, alignment=Qt.AlignCenter)
+        
+        # New label for Cue Info
+        self.cue_info_label = QLabel(""); self.cue_info_label.setObjectName("CueInfoLabel"); self.cue_info_label.setAlignment(Qt.AlignCenter); layout.addWidget(self.cue_info_label)
+
+        self.status_label = QLabel("IDLE"); self.status_label.setAlignment(Qt.AlignCenter); self.status_label.setAutoFillBackground(True); self.status_label.setMinimumHeight(30); self.status_label.setFont(self._STATUS_FONT); layout.addWidget(self.status_label)
+        
+        self.btn_master_sb = QPushButton("Master Standby"); self.btn_solo_op = QPushButton("Solo Standby")
+        self.btn_master_sb.clicked.connect(self.master_sb_clicked); self.btn_solo_op.clicked.connect(self.solo_op_clicked)
+        layout.addWidget(self.btn_master_sb); layout.addWidget(self.btn_solo_op)
+        
+        subs_header = QLabel("Confirmed Subscribers:"); subs_header.setObjectName("SubsHeader")
+        layout.addWidget(subs_header)
+
+        self.subscribers_list = QListWidget()
+        self.subscribers_list.setObjectName("SubscribersList")
+        layout.addWidget(self.subscribers_list, 1)
+
+    @Slot()
+    def master_sb_clicked(self):
+        if self.current_status == "standby_master": self.status_change_requested.emit(self.numeric_id, "idle")
+        else: self.status_change_requested.emit(self.numeric_id, "standby_master")
+
+    @Slot()
+    def solo_op_clicked(self):
+        if self.current_status == "standby_solo": self.status_change_requested.emit(self.numeric_id, "go")
+        else: self.status_change_requested.emit(self.numeric_id, "standby_solo")
+
+    @Slot(dict)
+    def update_display(self, data):
+        self.current_status = data.get("status", "idle")
+        label = data.get("label", f"Ch {self.numeric_id}")[:12]
+        color_hex = data.get("colorHex", "#CCCCCC")
+        text_color_hex = data.get("textColorHex", "#000000")
+        confirmed_subscribers = data.get("confirmed_subscribers", [])
+        cue_label = data.get("cueLabel", "")
+
+        # Skip the whole restyle when nothing visible changed — repeated
+        # status broadcasts would otherwise re-polish the widget subtree.
+        key = (self.current_status, label, color_hex, text_color_hex, tuple(confirmed_subscribers), cue_label)
+        if key == self._last_style_key: return
+        self._last_style_key = key
+
+        self.name_label.setText(label); self.name_label.setStyleSheet(channel_qss("name", color_hex))
+        self.setStyleSheet(channel_qss("frame", color_hex))
+
+        self._update_subscribers(confirmed_subscribers, color_hex)
+
+        self.btn_master_sb.setText("Master Standby"); self.btn_master_sb.setStyleSheet("background-color: #555; border: 2px outset #E74C3C;")
+        self.btn_solo_op.setText("Solo Standby"); self.btn_solo_op.setStyleSheet("background-color: #555; border: 2px outset #E74C3C;")
+        
+        if self.current_status == "standby_master": self.btn_master_sb.setStyleSheet(channel_qss("btn_standby", color_hex, text_color_hex))
+        elif self.current_status == "standby_solo": self.btn_solo_op.setText("Solo GO"); self.btn_solo_op.setStyleSheet("background-color: #2ECC71; color: black; font-weight: bold;")
+
+        if self.current_status in ["standby_master", "standby_solo", "go"]:
+            self.cue_info_label.setText(cue_label)
+        else:
+            self.cue_info_label.setText("")
+
+        if self.current_status in ["standby_master", "standby_solo"]:
+            self.status_label.setText("STANDBY"); self.status_label.setStyleSheet(channel_qss("status_standby", color_hex, text_color_hex))
+        elif self.current_status == "go":
+            self.status_label.setText(f"GO! ({GO_DURATION_MS // 1000})"); self.status_label.setStyleSheet(f"background-color: #E0E0E0; color: black; border-radius: 3px;")
+        else:
+            self.status_label.setText("IDLE"); self.status_label.setStyleSheet("background-color: #7f8c8d; color: white; border-radius: 3px;")
+
+    def _update_subscribers(self, names, color_hex):
+        # Only touch the delta; clear()+addItem per update is wasted widget
+        # churn when the subscriber set rarely changes.
+        if names == self._sub_names and color_hex == self._sub_color: return
+        lw = self.subscribers_list; color = cached_color(color_hex)
+        lw.setUpdatesEnabled(False)
+        try:
+            if names != self._sub_names:
+                wanted = set(names); current = set(self._sub_names)
+                for row in range(lw.count() - 1, -1, -1):
+                    if lw.item(row).text() not in wanted: lw.takeItem(row)
+                for name in names:
+                    if name not in current:
+                        item = QListWidgetItem(name); item.setFont(self._SUB_FONT); item.setForeground(color); lw.addItem(item)
+                self._sub_names = list(names)
+            if color_hex != self._sub_color:
+                for row in range(lw.count()): lw.item(row).setForeground(color)
+                self._sub_color = color_hex
+        finally:
+            lw.setUpdatesEnabled(True)
+
+    def set_countdown(self, seconds):
+        # Driven by the transmitter's shared 1 Hz tick rather than a timer
+        # per widget.
+        if self.current_status == "go":
+            self.status_label.setText(f"GO! ({seconds})")
+
+class ChannelConfigWidget(QWidget):
+    config_save_requested = Signal(dict)
+    view_change_requested = Signal(str)
+    def __init__(self, channels_data, parent=None):
+        super().__init__(parent); self.widgets = {}; self._init_ui(); self.update_config(channels_data) 
+    def update_config(self, channels_data):
+        # save_changes only touches top-level channel fields, so a one-level
+        # dict-of-dicts copy isolates the edit buffer without a deep copy.
+        self.temp_channels_data = {k: dict(v) if isinstance(v, dict) else v for k, v in channels_data.items()}
+        for i, widget_group in self.widgets.items():
+            channel_data = self.temp_channels_data.get(i)
+            if channel_data:
+                widget_group["name_edit"].setText(channel_data.get("label"))
+                widget_group["color_combo"].setCurrentText(channel_data.get("colorName"))
+    def _init_ui(self):
+        main_layout = QVBoxLayout(self); header_label = QLabel("Channel Configuration"); font = header_label.font(); font.setPointSize(16); font.setBold(True); header_label.setFont(font); header_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(header_label); grid_container = QWidget(); grid_layout = QGridLayout(grid_container)
+        for i in range(1, 9):
+            label_label = QLabel(f"Channel {i} Label:"); name_edit = QLineEdit(); name_edit.setMaxLength(12); color_label = QLabel("Color:"); color_combo = QComboBox()
+            color_combo.addItems(COLOR_OPTIONS_NAMES)
+            self.widgets[i] = {"name_edit": name_edit, "color_combo": color_combo}; grid_layout.addWidget(label_label, i-1, 0); grid_layout.addWidget(name_edit, i-1, 1); grid_layout.addWidget(color_label, i-1, 2); grid_layout.addWidget(color_combo, i-1, 3)
+        main_layout.addWidget(grid_container); main_layout.addStretch(); button_layout = QHBoxLayout(); button_layout.addStretch()
+        cancel_button = QPushButton("Cancel"); cancel_button.clicked.connect(self.cancel_changes)
+        save_button = QPushButton("Apply and Return"); save_button.setObjectName("SaveConfigButton"); save_button.clicked.connect(self.save_changes)
+        button_layout.addWidget(cancel_button); button_layout.addWidget(save_button); main_layout.addLayout(button_layout)
+    @Slot()
+    def cancel_changes(self): self.view_change_requested.emit("manual")
+    @Slot()
+    def save_changes(self):
+        for i, widget_group in self.widgets.items():
+            new_label = widget_group["name_edit"].text(); new_color_name = widget_group["color_combo"].currentText(); new_color_hex, new_text_color_hex = COLOR_OPTIONS_PY[new_color_name]
+            self.temp_channels_data[i]["label"] = new_label; self.temp_channels_data[i]["colorName"] = new_color_name; self.temp_channels_data[i]["colorHex"] = new_color_hex; self.temp_channels_data[i]["textColorHex"] = new_text_color_hex
+        self.config_save_requested.emit(self.temp_channels_data)
+
+class CueEditDialog(QDialog):
+    def __init__(self, cue_data, all_channels_data, parent=None):
+        super().__init__(parent); self.all_channels_data = all_channels_data
+        self.setMinimumWidth(400); self.checkboxes = {}; self._init_ui(); self.reset_for(cue_data)
+    def _init_ui(self):
+        layout = QVBoxLayout(self); grid_layout = QGridLayout(); grid_layout.addWidget(QLabel("Cue Number:"), 0, 0); self.num_edit = QLineEdit(); grid_layout.addWidget(self.num_edit, 0, 1); grid_layout.addWidget(QLabel("Cue Label:"), 1, 0); self.label_edit = QLineEdit(); self.label_edit.setMaxLength(30); grid_layout.addWidget(self.label_edit, 1, 1); layout.addLayout(grid_layout)
+        channels_group = QGroupBox("Channels in Cue"); channels_layout = QGridLayout(channels_group)
+        for i in range(1, 9):
+            checkbox = QCheckBox(f"{i}:")
+            self.checkboxes[i] = checkbox; row, col = divmod(i - 1, 4); channels_layout.addWidget(checkbox, row, col)
+        layout.addWidget(channels_group); self.button_box = QDialogButtonBox(); save_btn = self.button_box.addButton("Save Cue", QDialogButtonBox.ButtonRole.AcceptRole); cancel_btn = self.button_box.addButton("Cancel", QDialogButtonBox.ButtonRole.RejectRole)
+        self.delete_btn = self.button_box.addButton("Delete Cue", QDialogButtonBox.ButtonRole.DestructiveRole); self.delete_btn.setObjectName("DeleteCueButton"); self.delete_btn.clicked.connect(self.on_delete)
+        save_btn.clicked.connect(self.on_save); cancel_btn.clicked.connect(self.reject); layout.addWidget(self.button_box)
+    def reset_for(self, cue_data):
+        # Rebind fields on the existing widget tree; the dialog instance is
+        # reused across edits so checkbox construction isn't paid per open.
+        self.is_new_cue = cue_data is None; self.cue_data = cue_data if cue_data else {"cueNumber": "", "label": "", "channelsInCue": []}
+        self.setWindowTitle("Edit Cue" if not self.is_new_cue else "Add New Cue")
+        self.num_edit.setText(str(self.cue_data.get("cueNumber", ""))); self.label_edit.setText(self.cue_data.get("label", ""))
+        in_cue = set(self.cue_data.get("channelsInCue", []))
+        for i, checkbox in self.checkboxes.items():
+            ch_data = self.all_channels_data.get(i)
+            checkbox.setVisible(ch_data is not None)
+            if ch_data is not None: checkbox.setText(f"{i}: {ch_data.get('label')}"); checkbox.setChecked(i in in_cue)
+        self.delete_btn.setVisible(not self.is_new_cue)
+    @Slot()
+    def on_save(self):
+        try: cue_num_float = float(self.num_edit.text())
+        except ValueError: QMessageBox.warning(self, "Invalid Input", "Cue Number must be a valid number."); return
+        selected_channels = [i for i, checkbox in self.checkboxes.items() if checkbox.isChecked()]
+        self.cue_data['cueNumber'] = self.num_edit.text(); self.cue_data['cueNumberFloat'] = cue_num_float; self.cue_data['label'] = self.label_edit.text(); self.cue_data['channelsInCue'] = selected_channels; self.cue_data['_channelsStr'] = ", ".join(map(str, selected_channels))
+        if 'id' not in self.cue_data: self.cue_data['id'] = uuid.uuid4().hex
+        self.accept()
+    @Slot()
+    def on_delete(self):
+        if QMessageBox.question(self, "Delete Cue", f"Are you sure you want to delete Cue {self.cue_data.get('cueNumber')}?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes: self.done(QDialog.DialogCode.DestructiveRole)
+    def get_data(self): return self.cue_data
+
+class CueStatusDisplay(QFrame):
+    _QSS_IDLE = channel_qss("cue_status", "#7f8c8d", "#FFFFFF")
+    _QSS_GO = channel_qss("cue_status", "#E0E0E0", "#000000")
+
+    def __init__(self, channels_data, parent=None):
+        super().__init__(parent); self.labels = [None] * 9; self._last_state = {}; self.setFrameShape(QFrame.Shape.StyledPanel); self.setObjectName("CueStatusFrame"); self._init_ui(channels_data)
+    def _init_ui(self, channels_data):
+        layout = QGridLayout(self)
+        for i in range(1, 9): label = QLabel(f"Ch {i}: IDLE"); label.setAlignment(Qt.AlignCenter); label.setAutoFillBackground(True); label.setMinimumHeight(25); self.labels[i] = label; row, col = divmod(i - 1, 4); layout.addWidget(label, row, col)
+        self.update_all(channels_data)
+    @Slot(dict)
+    def update_all(self, channels_data):
+        for channel_id, data in channels_data.items():
+            self.update_single(channel_id, data)
+    @Slot(int, dict)
+    def update_single(self, channel_id, data):
+        if not (0 < channel_id < len(self.labels)) or self.labels[channel_id] is None: return
+        status = data.get("status", "idle"); label = data.get("label", f"Ch {channel_id}")[:12]; color_hex = data.get("colorHex", "#CCCCCC"); text_color_hex = data.get("textColorHex", "#000000")
+        key = (status, label, color_hex, text_color_hex)
+        if key == self._last_state.get(channel_id): return
+        self._last_state[channel_id] = key
+        label_widget = self.labels[channel_id]
+        status_text = "STANDBY" if "standby" in status else status.upper(); label_widget.setText(f"{label}: {status_text}")
+        if "standby" in status: qss = channel_qss("cue_status", color_hex, text_color_hex)
+        elif status == "go": qss = self._QSS_GO
+        else: qss = self._QSS_IDLE
+        label_widget.setStyleSheet(qss)
+
+class CueListWidget(QWidget):
+    cue_action_requested = Signal(str, object)
+    def __init__(self, cues_data, channels_data, parent=None):
+        super().__init__(parent); self.channels_data = channels_data; self._last_cues_sig = None; self._cue_by_id = {}; self._init_ui(); self.update_cues(cues_data)
+    def _init_ui(self):
+        layout = QVBoxLayout(self); self.status_display = CueStatusDisplay(self.channels_data); layout.addWidget(self.status_display)
+        header_layout = QHBoxLayout(); header_label = QLabel("Cue List"); font = header_label.font(); font.setPointSize(16); font.setBold(True); header_label.setFont(font)
+        header_layout.addWidget(header_label); header_layout.addStretch(); add_cue_btn = QPushButton("Add New Cue"); add_cue_btn.clicked.connect(self.add_new_cue); header_layout.addWidget(add_cue_btn); layout.addLayout(header_layout)
+        self.table = QTableWidget(); self.table.setColumnCount(4); self.table.setHorizontalHeaderLabels(["Cue", "Label", "Channels", "Actions"]); self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch); self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive); self.table.setSortingEnabled(True); layout.addWidget(self.table)
+    def update_cues(self, cues_data): self.cues_data = cues_data; self.populate_table()
+    def populate_table(self):
+        # cues_data arrives pre-sorted (the transmitter keeps it that way via
+        # bisect), so rows are laid down in order with no sort pass here.
+        # Rebuilding the table means fresh items, widgets and a relayout per
+        # row; skip it entirely when the cue list is unchanged since last time.
+        sig = tuple((c.get('id'), c.get('cueNumber'), c.get('label'), tuple(c.get("channelsInCue", []))) for c in self.cues_data)
+        if sig == self._last_cues_sig: return
+        self._last_cues_sig = sig
+        self.table.setSortingEnabled(False)
+        if self.table.rowCount() != len(self.cues_data): self.table.setRowCount(len(self.cues_data))
+        self._cue_by_id = {c.get('id'): c for c in self.cues_data}
+        for row, cue in enumerate(self.cues_data):
+            self._set_cell(row, 0, cue.get('cueNumber'), float(cue.get('cueNumberFloat', 0)))
+            self._set_cell(row, 1, cue.get('label'))
+            self._set_cell(row, 2, cue.get('_channelsStr', ''))
+            edit_btn = self.table.cellWidget(row, 3)
+            if edit_btn is None:
+                # One shared slot serves every row; the button carries its cue
+                # id as a dynamic property, so no per-row closure is built.
+                edit_btn = QPushButton("Edit"); edit_btn.clicked.connect(self._on_edit_clicked); self.table.setCellWidget(row, 3, edit_btn)
+            edit_btn.setProperty("cue_id", cue.get('id'))
+        self.table.setSortingEnabled(True)
+    @Slot()
+    def _on_edit_clicked(self):
+        cue = self._cue_by_id.get(self.sender().property("cue_id"))
+        if cue is not None: self.edit_cue(cue)
+    def _set_cell(self, row, col, display_value, sort_value=None):
+        item = self.table.item(row, col)
+        if item is None:
+            item = QTableWidgetItem(); self.table.setItem(row, col, item)
+        item.setData(Qt.ItemDataRole.DisplayRole, display_value)
+        if sort_value is not None: item.setData(Qt.ItemDataRole.UserRole, sort_value)
+    @Slot()
+    def add_new_cue(self): self.cue_action_requested.emit("add", None)
+    def edit_cue(self, cue_data): self.cue_action_requested.emit("edit", cue_data)
+
+# ... (ReceiverWindow implementation follows)
+
+class TransmitterWindow(QMainWindow):
+    # Only these channel fields go over MQTT; local bookkeeping like
+    # confirmed_subscribers never needs to leave the transmitter.
+    _WIRE_FIELDS = ("id", "numericId", "label", "colorHex", "textColorHex", "status")
+
+    def __init__(self):
+        super().__init__(); self.setWindowTitle("Cue Light Transmitter (Offline Mode)"); self.setGeometry(0, 0, 800, 480); self.setStyleSheet("background-color: #2c3e50; color: white;")
+        # channels_data is keyed by int channel id (1..8) in memory — string
+        # keys exist only in the JSON file and on the wire. Show-level
+        # metadata lives in meta_data so iteration never has to filter keys.
+        self.channels_data = {}; self.meta_data = {"transmitter_name": "CueLight-TX"}; self.cues = []; self._cue_keys = []; self._cue_index = {}; self.current_show_filepath = DEFAULT_SHOW_FILE; self.transmitter_id = f"tx_{uuid.uuid4().hex[:8]}"; self.pending_requests = {}; self.current_cue_index = -1; self.is_current_cue_armed = False
+        self.zeroconf = None
+        self._update_depth = 0; self._update_dirty = False
+        # One shared timer walks a heap of (deadline, channel) GO expiries
+        # instead of allocating a QTimer.singleShot per fired channel.
+        self._go_heap = []
+        # Channels currently armed for master GO, so firing iterates only
+        # the armed set instead of scanning channels_data.
+        self._standby_master_ids = set()
+        self._go_timer = QTimer(self); self._go_timer.setInterval(50); self._go_timer.timeout.connect(self._check_go_expiry)
+        # One 1 Hz tick updates every channel countdown; the per-widget
+        # countdown timers are gone.
+        self._active_counters = {}
+        self._tick_timer = QTimer(self); self._tick_timer.setInterval(1000); self._tick_timer.timeout.connect(self._tick_all)
+        # Confirmation bursts coalesce into one redraw via this single-shot
+        # timer instead of a full UI refresh per message.
+        self._ui_refresh_timer = QTimer(self); self._ui_refresh_timer.setSingleShot(True); self._ui_refresh_timer.setInterval(30); self._ui_refresh_timer.timeout.connect(self.update_all_channel_displays)
+        self._hdr_state = None
+        self._save_timer = QTimer(self); self._save_timer.setSingleShot(True); self._save_timer.setInterval(100); self._save_timer.timeout.connect(self._flush_save)
+        self._cue_dialog = None
+        prewarm_channel_qss()
+        self.setup_mqtt(); self.setup_zeroconf(); self._init_ui(); self.handle_startup_choice()
+    def _schedule_go_expiry(self, numeric_id):
+        heapq.heappush(self._go_heap, (time.monotonic() + GO_DURATION_MS / 1000, numeric_id))
+        if not self._go_timer.isActive(): self._go_timer.start()
+        self._active_counters[numeric_id] = GO_DURATION_MS // 1000
+        if not self._tick_timer.isActive(): self._tick_timer.start()
+    @Slot()
+    def _tick_all(self):
+        for numeric_id in list(self._active_counters):
+            self._active_counters[numeric_id] -= 1
+            seconds = self._active_counters[numeric_id]
+            if seconds < 0:
+                del self._active_counters[numeric_id]; continue
+            widget = self.channel_widgets[numeric_id] if 0 < numeric_id < len(self.channel_widgets) else None
+            if widget: widget.set_countdown(seconds)
+        if not self._active_counters: self._tick_timer.stop()
+    @Slot()
+    def _check_go_expiry(self):
+        # Channels fired together expire together, so pop everything due in
+        # this tick and revert it as one bulk publish + repaint.
+        now = time.monotonic(); expired = []
+        while self._go_heap and self._go_heap[0][0] <= now:
+            _, numeric_id = heapq.heappop(self._go_heap)
+            if self.channels_data.get(numeric_id, {}).get('status') == 'go': expired.append(numeric_id)
+        if expired:
+            for numeric_id in expired:
+                ch = self.channels_data[numeric_id]
+                if 'confirmed_subscribers' in ch: ch['confirmed_subscribers'].clear()
+            self._apply_status_bulk(expired, 'idle')
+        if not self._go_heap: self._go_timer.stop()
+    def setup_zeroconf(self):
+        if not ZEROCONF_AVAILABLE: return
+        try:
+            self.zeroconf = Zeroconf(); self.zeroconf.register_service(get_service_info())
+        except Exception as e: print(f"Zeroconf: Could not register service: {e}"); self.zeroconf = None
+    def _init_ui(self):
+        self.main_widget = QWidget(); main_layout = QVBoxLayout(self.main_widget); self.setCentralWidget(self.main_widget); self._create_menus()
+        self.top_nav_widget = self.create_top_nav(); main_layout.addWidget(self.top_nav_widget)
+        self.header_widget = self.create_header(); main_layout.addWidget(self.header_widget)
+        self.content_stack = QStackedWidget(); main_layout.addWidget(self.content_stack)
+        # Only the manual view is built upfront; the cue list and config views
+        # (table + combo boxes) are constructed on first visit.
+        self.manual_view_widget = self.create_manual_view(); self.cues_view_widget = None; self.channel_config_widget = None
+        self.content_stack.addWidget(self.manual_view_widget)
+        self.show_manual_view()
+    def _create_menus(self):
+        menu_bar = self.menuBar(); file_menu = menu_bar.addMenu("&File"); new_action = QAction("&New Show", self); new_action.triggered.connect(self.handle_new_config); file_menu.addAction(new_action); load_action = QAction("&Load Show...", self); load_action.triggered.connect(self.handle_load_config); file_menu.addAction(load_action); save_action = QAction("&Save Show", self); save_action.triggered.connect(lambda: self.save_config()); file_menu.addAction(save_action); save_as_action = QAction("&Save Show As...", self); save_as_action.triggered.connect(self.handle_save_config_as); file_menu.addAction(save_as_action); file_menu.addSeparator(); exit_action = QAction("&Exit", self); exit_action.triggered.connect(self.close); file_menu.addAction(exit_action)
+    def handle_startup_choice(self):
+        msg_box = QMessageBox(self); msg_box.setWindowTitle("Welcome"); msg_box.setText("Start a new show, load a show, or continue where you left off?"); btn_new = msg_box.addButton("New Show", QMessageBox.ButtonRole.ActionRole); btn_load = msg_box.addButton("Load Show...", QMessageBox.ButtonRole.ActionRole); btn_continue = msg_box.addButton("Continue Last Session", QMessageBox.ButtonRole.AcceptRole); msg_box.exec()
+        if msg_box.clickedButton() == btn_new: self.handle_new_config()
+        elif msg_box.clickedButton() == btn_load: self.handle_load_config()
+        else: self.load_config(DEFAULT_SHOW_FILE)
+    def create_top_nav(self):
+        nav_widget = QFrame(); nav_layout = QHBoxLayout(nav_widget); nav_widget.setObjectName("TopNav"); nav_layout.setContentsMargins(5,2,5,2)
+        self.btn_manual_mode = QPushButton("Manual"); self.btn_cues_mode = QPushButton("Cues"); self.btn_channel_config = QPushButton("Channel Config")
+        self.nav_buttons = [self.btn_manual_mode, self.btn_cues_mode, self.btn_channel_config]
+        for btn in self.nav_buttons: btn.setCheckable(True); nav_layout.addWidget(btn)
+        self.btn_manual_mode.clicked.connect(self.show_manual_view); self.btn_cues_mode.clicked.connect(self.show_cues_view); self.btn_channel_config.clicked.connect(self.show_channel_config_view)
+        return nav_widget
+    def create_header(self):
+        header_widget = QFrame(); header_layout = QHBoxLayout(header_widget); header_widget.setObjectName("Header");
+        self.mqtt_status_label = QLabel("MQTT: Disconnected"); header_layout.addWidget(self.mqtt_status_label); header_layout.addStretch()
+        self.header_controls_widget = QWidget(); controls_layout = QHBoxLayout(self.header_controls_widget); controls_layout.setContentsMargins(0,0,0,0)
+        self.master_go_button = QPushButton("MASTER GO"); self.master_go_button.setObjectName("MasterGoButton"); self.master_go_button.clicked.connect(self.fire_master_go)
+        controls_layout.addWidget(self.master_go_button); separator = QFrame(); separator.setFrameShape(QFrame.Shape.VLine); separator.setFrameShadow(QFrame.Shadow.Sunken); controls_layout.addWidget(separator)
+        self.cue_controls_widget = self.create_cue_controls(); controls_layout.addWidget(self.cue_controls_widget); header_layout.addWidget(self.header_controls_widget)
+        return header_widget
+    def create_cue_controls(self):
+        widget = QWidget(); layout = QHBoxLayout(widget); layout.setContentsMargins(0,0,0,0)
+        self.btn_prev_cue = QPushButton("<< Prev"); self.btn_prev_cue.clicked.connect(self.prev_cue); layout.addWidget(self.btn_prev_cue)
+        self.cue_standby_label = QLabel("Standby Cue: --"); self.cue_standby_label.setObjectName("CueStandbyLabel"); layout.addWidget(self.cue_standby_label)
+        self.btn_arm_cue = QPushButton("ARM CUE"); self.btn_arm_cue.setObjectName("ArmCueButton"); self.btn_arm_cue.setProperty("armed", False); self.btn_arm_cue.clicked.connect(self.arm_current_cue); layout.addWidget(self.btn_arm_cue)
+        self.btn_go_cue = QPushButton("GO CUE"); self.btn_go_cue.setObjectName("GoCueButton"); self.btn_go_cue.clicked.connect(self.go_current_cue); layout.addWidget(self.btn_go_cue)
+        self.btn_next_cue = QPushButton("Next >>"); self.btn_next_cue.clicked.connect(self.next_cue); layout.addWidget(self.btn_next_cue)
+        return widget
+    def setup_mqtt(self):
+        confirmation_topic = f"{MQTT_APP_ID}/confirmations/{self.transmitter_id}"; self.mqtt_thread = QThread(); self.mqtt_worker = MqttWorker(MQTT_BROKER, MQTT_PORT, [confirmation_topic]); self.mqtt_worker.moveToThread(self.mqtt_thread)
+        self.mqtt_thread.started.connect(self.mqtt_worker.run); self.mqtt_worker.connection_status.connect(self.update_mqtt_status_indicator); self.mqtt_thread.start()
+        self.inbox_timer = QTimer(self); self.inbox_timer.timeout.connect(lambda: self.mqtt_worker.drain_inbox(self.on_confirmation_received)); self.inbox_timer.start(MqttWorker.INBOX_DRAIN_MS)
+    @Slot(bool)
+    def update_mqtt_status_indicator(self, connected): color = "#4CAF50" if connected else "#F44336"; self.mqtt_status_label.setText(f"MQTT: {'Connected' if connected else 'Disconnected'}"); self.mqtt_status_label.setStyleSheet(f"background-color: {color}; color: white; padding: 2px; border-radius: 3px;")
+    @Slot(str, bytes)
+    def on_confirmation_received(self, topic, payload):
+        try:
+            data = json_loads(payload); request_id = data.get("request_id"); receiver_name = data.get("receiver_name", "Unknown Receiver")
+            if request_id in self.pending_requests:
+                channel_id = self.pending_requests[request_id]
+                ch = self.channels_data.get(channel_id)
+                if ch is not None:
+                    if 'confirmed_subscribers' not in ch: ch['confirmed_subscribers'] = []
+                    if receiver_name not in ch['confirmed_subscribers']: ch['confirmed_subscribers'].append(receiver_name)
+                    if not self._ui_refresh_timer.isActive(): self._ui_refresh_timer.start()
+        except ValueError as e: print(f"Error decoding confirmation payload: {e}")
+    def load_config(self, filepath=None):
+        target_file = filepath or DEFAULT_SHOW_FILE
+        if os.path.exists(target_file):
+            try:
+                config = _load_show_file(target_file); self.channels_data = {int(k): v for k, v in config.get("channels", {}).items() if k.isdigit()}; self.meta_data = {"transmitter_name": config.get("transmitter_name", "CueLight-TX")}; self.cues = config.get("cues", []); self.current_show_filepath = target_file; print(f"Config loaded from {target_file}")
+            except Exception as e: print(f"Error reading {target_file}: {e}. Starting with defaults."); self.create_default_config()
+        else:
+            self.create_default_config()
+        # Cues are sorted once here and kept sorted by the add/edit/delete
+        # paths (bisect against _cue_keys), so views never re-sort.
+        self.cues.sort(key=cue_sort_key)
+        self._cue_keys = [cue_sort_key(c) for c in self.cues]
+        self._reindex_cues()
+        for cue in self.cues:  # backfill display cache for shows saved before it existed
+            if '_channelsStr' not in cue: cue['_channelsStr'] = ", ".join(map(str, cue.get("channelsInCue", [])))
+        self.current_cue_index = 0 if self.cues else -1
+        self._prepare_channels()
+        for ch in self.channels_data.values():
+            ch['status'] = 'idle'
+            # Reuse the list across shows rather than reallocating per reset.
+            if 'confirmed_subscribers' in ch: ch['confirmed_subscribers'].clear()
+            else: ch['confirmed_subscribers'] = []
+        self._reset_live_status_state()
+        if hasattr(self, 'channel_widgets'): self.update_all_channel_displays(); self.update_cue_header_display()
+        self.setWindowTitle(f"Transmitter - {os.path.basename(self.current_show_filepath or 'New Show')}")
+    def create_default_config(self):
+        self.channels_data = {};
+        for i in range(1, 9):
+            color_name = COLOR_OPTIONS_NAMES[i % len(COLOR_OPTIONS_NAMES)]; bg_hex, text_hex = COLOR_OPTIONS_PY[color_name]
+            self.channels_data[i] = {"id": f"channel_{i}", "numericId": i, "label": f"Channel {i}", "colorName": color_name, "colorHex": bg_hex, "textColorHex": text_hex}
+        self.meta_data = {"transmitter_name": "CueLight-TX"}
+        self._prepare_channels(); self._reset_live_status_state()
+        self.cues = []; self._cue_keys = []; self._cue_index = {}; self.current_show_filepath = None; self.current_cue_index = -1
+    def _reset_live_status_state(self):
+        # Every path that forces all channels back to idle must also drop the
+        # armed set, countdowns and pending GO expiries — otherwise MASTER GO
+        # after File > New Show would fire channels armed in the old show.
+        self._standby_master_ids.clear(); self._active_counters.clear(); self._go_heap.clear()
+    def _prepare_channels(self):
+        # Per-channel wire constants: the status topic never changes, so it is
+        # formatted once (kept as str — the publish signal and paho both want
+        # str topics); the cached idle payload is dropped so it rebuilds
+        # against the current labels/colors.
+        for cid, ch in self.channels_data.items():
+            ch['_topic_status'] = f"{MQTT_APP_ID}/channel/{cid}/status"
+            ch.pop('_idle_payload', None)
+    def save_config(self, filepath=None):
+        # Debounced: rapid edits coalesce into one background write; an
+        # explicit filepath (Save As, shutdown) flushes immediately.
+        target_file = filepath or self.current_show_filepath
+        if not target_file: self.handle_save_config_as(); return
+        self.current_show_filepath = target_file; self.setWindowTitle(f"Transmitter - {os.path.basename(target_file)}")
+        if filepath: self._flush_save()
+        elif not self._save_timer.isActive(): self._save_timer.start()
+    @Slot()
+    def _flush_save(self):
+        self._save_timer.stop()
+        target_file = self.current_show_filepath
+        if not target_file: return
+        # channels_data is int-keyed in memory; the file keeps string keys.
+        # Runtime state and _-prefixed wire caches stay out of the file.
+        channels_to_save = {str(k): {k2: v2 for k2, v2 in v.items() if k2 not in ['status', 'confirmed_subscribers'] and not k2.startswith('_')} for k, v in self.channels_data.items()}
+        cues_to_save = [{k: v for k, v in cue.items() if not k.startswith('_')} for cue in self.cues]
+        config_to_save = {"channels": channels_to_save, "cues": cues_to_save, "transmitter_name": self.meta_data.get('transmitter_name', 'CueLight-TX')}
+        # Serialize here (cheap, and safe from later mutation); the disk I/O
+        # runs on the global thread pool.
+        QThreadPool.globalInstance().start(_ShowWriteJob(json_dumps(config_to_save), target_file))
+    @Slot()
+    def handle_new_config(self): self.create_default_config(); self.update_all_channel_displays(); self.update_cue_header_display(); self.setWindowTitle("Transmitter - New Show*")
+    @Slot()
+    def handle_save_config_as(self):
+        filepath, _ = QFileDialog.getSaveFileName(self, "Save Show As", "", "Show Files (*.qlx);;All Files (*)");
+        if filepath: self.save_config(filepath)
+    @Slot()
+    def handle_load_config(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Load Show", "", "Show Files (*.qlx);;All Files (*)");
+        if filepath: self.load_config(filepath)
+    def _update_nav_buttons(self, active_button):
+        for btn in self.nav_buttons: btn.setChecked(btn == active_button)
+        is_operational = active_button in [self.btn_manual_mode, self.btn_cues_mode]
+        self.header_controls_widget.setVisible(is_operational)
+    @Slot()
+    def show_manual_view(self): self._update_nav_buttons(self.btn_manual_mode); self.content_stack.setCurrentWidget(self.manual_view_widget); self.update_all_channel_displays()
+    @Slot()
+    def show_cues_view(self):
+        self._update_nav_buttons(self.btn_cues_mode)
+        if self.cues_view_widget is None:
+            self.cues_view_widget = CueListWidget(self.cues, self.channels_data); self.content_stack.addWidget(self.cues_view_widget)
+            self.cues_view_widget.cue_action_requested.connect(self.handle_cue_action)
+        self.cues_view_widget.update_cues(self.cues); self.cues_view_widget.status_display.update_all(self.channels_data); self.content_stack.setCurrentWidget(self.cues_view_widget); self.update_cue_header_display()
+    @Slot()
+    def show_channel_config_view(self):
+        self._update_nav_buttons(self.btn_channel_config)
+        if self.channel_config_widget is None:
+            self.channel_config_widget = ChannelConfigWidget(self.channels_data); self.content_stack.addWidget(self.channel_config_widget)
+            self.channel_config_widget.config_save_requested.connect(self.on_config_saved); self.channel_config_widget.view_change_requested.connect(self.show_manual_view)
+        self.channel_config_widget.update_config(self.channels_data); self.content_stack.setCurrentWidget(self.channel_config_widget)
+    @Slot(dict)
+    def on_config_saved(self, new_channels_data):
+        with self.batch_updates():
+            self.channels_data = new_channels_data; self._prepare_channels(); self.save_config()
+            payload = {str(ch_id): {"label": ch_data['label'], "colorHex": ch_data['colorHex']} for ch_id, ch_data in self.channels_data.items()}
+            qos, retain = qos_for_topic(MQTT_CONFIG_BULK_TOPIC); self.mqtt_worker.publish(MQTT_CONFIG_BULK_TOPIC, payload, qos, retain)
+            self.show_manual_view()
+    def create_manual_view(self):
+        # Indexed by channel id (slot 0 unused): fixed contiguous ids make a
+        # list lookup cheaper than hashing in the per-update loop.
+        widget = QWidget(); layout = QGridLayout(widget); self.channel_widgets = [None] * 9
+        for i in range(1, 9):
+            col_widget = ChannelColumnWidget(i); col_widget.status_change_requested.connect(self.handle_status_change); self.channel_widgets[i] = col_widget
+            row, col = divmod(i - 1, 4); layout.addWidget(col_widget, row, col)
+        return widget
+    @contextmanager
+    def batch_updates(self):
+        # Reentrant: nested scopes just bump the depth; the refresh deferred
+        # by update_all_channel_displays runs once at the outermost exit.
+        self._update_depth += 1
+        try:
+            yield
+        finally:
+            self._update_depth -= 1
+            if self._update_depth == 0 and self._update_dirty:
+                self._update_dirty = False
+                self.update_all_channel_displays()
+    def update_all_channel_displays(self):
+        if self._update_depth > 0:
+            self._update_dirty = True
+            return
+        widgets = self.channel_widgets
+        for i, channel_data in self.channels_data.items():
+            if 0 < i < len(widgets) and widgets[i]: widgets[i].update_display(channel_data)
+        if getattr(self, 'cues_view_widget', None) is not None: self.cues_view_widget.status_display.update_all(self.channels_data)
+    def _apply_status(self, numeric_id, new_status):
+        # State mutation and payload build shared by the single-channel and
+        # bulk paths; returns (topic, payload) for the caller to publish.
+        ch = self.channels_data.get(numeric_id)
+        if ch is None: return None
+
+        old_status = ch.get('status', 'idle')
+        if "standby" in old_status and "standby" not in new_status:
+            requests_to_remove = [req_id for req_id, ch_id in self.pending_requests.items() if ch_id == numeric_id]
+            for req_id in requests_to_remove:
+                del self.pending_requests[req_id]
+
+        ch['status'] = new_status
+        if new_status == "standby_master": self._standby_master_ids.add(numeric_id)
+        else: self._standby_master_ids.discard(numeric_id)
+        if new_status == "go": self._schedule_go_expiry(numeric_id)
+        else: self._active_counters.pop(numeric_id, None)
+        if new_status == "idle":
+            # Idle payloads are constant between config edits (the receiver
+            # ignores cueLabel on idle), so cache the serialized bytes.
+            payload = ch.get('_idle_payload')
+            if payload is None:
+                payload = ch['_idle_payload'] = json_dumps({k: ch[k] for k in self._WIRE_FIELDS if k in ch})
+            return ch['_topic_status'], payload
+        payload_data = {k: ch[k] for k in self._WIRE_FIELDS if k in ch}
+        if "standby" in new_status:
+            request_id = uuid.uuid4().hex
+            payload_data["request_id"] = request_id
+            payload_data["response_topic"] = f"{MQTT_APP_ID}/confirmations/{self.transmitter_id}"
+            self.pending_requests[request_id] = numeric_id
+
+        if self.current_cue_index != -1:
+            payload_data["cueLabel"] = self.cues[self.current_cue_index].get('label', '')
+
+        return ch['_topic_status'], payload_data
+    @Slot(int, str)
+    def handle_status_change(self, numeric_id, new_status):
+        message = self._apply_status(numeric_id, new_status)
+        if message is None: return
+        self.mqtt_worker.publish(*message)
+        self.update_all_channel_displays()
+    def _apply_status_bulk(self, channel_ids, new_status):
+        # Mutate every channel first (_apply_status touches no widgets), then
+        # hand the publishes to the worker in one batch. Updates are held on
+        # the manual view while the columns restyle so the burst composites
+        # into a single paint instead of one per channel.
+        messages = [m for m in (self._apply_status(cid, new_status) for cid in channel_ids) if m]
+        if messages: self.mqtt_worker.publish_many(messages)
+        view = self.manual_view_widget
+        view.setUpdatesEnabled(False)
+        try: self.update_all_channel_displays()
+        finally: view.setUpdatesEnabled(True)
+    @Slot()
+    def fire_master_go(self):
+        self._apply_status_bulk(sorted(self._standby_master_ids), "go")
+    def update_cue_header_display(self):
+        cue = self.cues[self.current_cue_index] if self.current_cue_index != -1 and self.cues else None
+        state = (self.current_cue_index, self.is_current_cue_armed,
+                 cue and cue.get('cueNumber'), cue and cue.get('label'))
+        # Callers invoke this liberally; skip the label rewrite and the
+        # button restyle (which re-polishes) when nothing visible changed.
+        if state == self._hdr_state: return
+        self._hdr_state = state
+        self._update_cue_label(cue); self._update_arm_buttons(cue)
+    def _update_cue_label(self, cue):
+        if cue is not None: self.cue_standby_label.setText(f"Standby Cue: {cue.get('cueNumber')} - {cue.get('label')}")
+        else: self.cue_standby_label.setText("Standby Cue: --")
+    def _update_arm_buttons(self, cue):
+        if cue is not None:
+            # The armed/idle colors live in the app stylesheet keyed on this
+            # dynamic property; flipping it re-polishes just this button
+            # instead of re-parsing an inline stylesheet.
+            btn = self.btn_arm_cue
+            if btn.property("armed") != self.is_current_cue_armed:
+                btn.setProperty("armed", self.is_current_cue_armed); btn.style().unpolish(btn); btn.style().polish(btn)
+            btn.setEnabled(not self.is_current_cue_armed); self.btn_go_cue.setEnabled(self.is_current_cue_armed)
+        else:
+            self.btn_arm_cue.setEnabled(False); self.btn_go_cue.setEnabled(False)
+    @Slot()
+    def arm_current_cue(self):
+        if self.current_cue_index == -1 or not self.cues: return
+        cue = self.cues[self.current_cue_index]
+        self._apply_status_bulk(cue.get("channelsInCue", []), "standby_master")
+        self.is_current_cue_armed = True; self.update_cue_header_display()
+    @Slot()
+    def go_current_cue(self):
+        if not self.is_current_cue_armed or self.current_cue_index == -1: return
+        cue = self.cues[self.current_cue_index]
+        self._apply_status_bulk(cue.get("channelsInCue", []), "go")
+        self.is_current_cue_armed = False; self.next_cue()
+    @Slot()
+    def next_cue(self):
+        if len(self.cues) == 0: return
+        if self.current_cue_index < len(self.cues) - 1: self.current_cue_index += 1
+        else: self.current_cue_index = 0
+        self.is_current_cue_armed = False; self.update_cue_header_display()
+    @Slot()
+    def prev_cue(self):
+        if len(self.cues) == 0: return
+        if self.current_cue_index > 0: self.current_cue_index -= 1
+        else: self.current_cue_index = len(self.cues) - 1
+        self.is_current_cue_armed = False; self.update_cue_header_display()
+    def _cue_edit_dialog(self, cue_data):
+        # One long-lived dialog; reset_for refreshes channel labels from the
+        # current channels_data on every open, so no rebuild is needed.
+        if self._cue_dialog is None:
+            self._cue_dialog = CueEditDialog(cue_data, self.channels_data, self)
+        else:
+            self._cue_dialog.all_channels_data = self.channels_data; self._cue_dialog.reset_for(cue_data)
+        return self._cue_dialog
+    def _reindex_cues(self):
+        # id -> position map so edit/delete resolve in O(1) instead of
+        # scanning the cue list.
+        self._cue_index = {c['id']: i for i, c in enumerate(self.cues)}
+    def _insert_cue_sorted(self, cue):
+        key = cue_sort_key(cue); idx = bisect.bisect(self._cue_keys, key)
+        self._cue_keys.insert(idx, key); self.cues.insert(idx, cue); self._reindex_cues()
+    def _remove_cue(self, cue_id):
+        i = self._cue_index.get(cue_id)
+        if i is None: return None
+        cue = self.cues.pop(i); self._cue_keys.pop(i); self._reindex_cues(); return cue
+    @Slot(str, object)
+    def handle_cue_action(self, action, data):
+        if action == "add":
+            dialog = self._cue_edit_dialog(None)
+            if dialog.exec() == QDialog.DialogCode.Accepted:
+                self._insert_cue_sorted(dialog.get_data()); self.save_config(); self.show_cues_view()
+        elif action == "edit":
+            dialog = self._cue_edit_dialog(data); result = dialog.exec()
+            if result == QDialog.DialogCode.Accepted:
+                updated_cue = dialog.get_data()
+                # Re-insert so a changed cue number lands in sorted position.
+                self._remove_cue(updated_cue.get('id')); self._insert_cue_sorted(updated_cue)
+                self.save_config(); self.show_cues_view()
+            elif result == QDialog.DialogCode.DestructiveRole:
+                self._remove_cue(data.get('id')); self.save_config(); self.show_cues_view()
+    def closeEvent(self, event):
+        self.save_config(DEFAULT_SHOW_FILE)
+        if self.zeroconf:
+            try: self.zeroconf.unregister_service(get_service_info()); self.zeroconf.close()
+            except Exception as e: print(f"Zeroconf: Error during shutdown: {e}")
+        self.mqtt_worker.stop(); self.mqtt_thread.quit(); self.mqtt_thread.wait()
+        QThreadPool.globalInstance().waitForDone(1000)
+        super().closeEvent(event)
+
+# =============================================================================
+# --- RECEIVER WIDGETS AND WINDOW ---
+# =============================================================================
+class ReceiverSettingsDialog(QDialog):
+    def __init__(self, current_name, current_channel_id, current_broker_ip, parent=None):
+        super().__init__(parent); self.setWindowTitle("Receiver Settings"); layout = QVBoxLayout(self)
+        name_layout = QHBoxLayout(); name_layout.addWidget(QLabel("Receiver Name:")); self.name_edit = QLineEdit(current_name); self.name_edit.setMaxLength(12); name_layout.addWidget(self.name_edit); layout.addLayout(name_layout)
+        channel_layout = QHBoxLayout(); channel_layout.addWidget(QLabel("Subscribe to Channel:")); self.channel_combo = QComboBox(); self.channel_combo.addItems([str(i) for i in range(1, 9)]); self.channel_combo.setCurrentText(str(current_channel_id)); channel_layout.addWidget(self.channel_combo); layout.addLayout(channel_layout)
+        broker_layout = QHBoxLayout(); broker_layout.addWidget(QLabel("Broker IP:")); self.broker_edit = QLineEdit(current_broker_ip); broker_layout.addWidget(self.broker_edit); layout.addLayout(broker_layout)
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel); self.button_box.accepted.connect(self.accept); self.button_box.rejected.connect(self.reject); layout.addWidget(self.button_box)
+    def get_settings(self): return {"name": self.name_edit.text(), "channel_id": self.channel_combo.currentText(), "broker_ip": self.broker_edit.text()}
+
+class ReceiverWindow(QMainWindow):
+    # Shared fonts, built once after the QApplication exists — same pattern
+    # as ChannelColumnWidget, instead of five font() copies in _init_ui.
+    _FONT_NAME = None; _FONT_INFO = None; _FONT_STATUS = None; _FONT_CONFIRM = None
+
+    @classmethod
+    def _init_shared_fonts(cls):
+        if cls._FONT_NAME is None:
+            cls._FONT_NAME = QFont(); cls._FONT_NAME.setPointSize(24)
+            cls._FONT_INFO = QFont(); cls._FONT_INFO.setPointSize(16)
+            cls._FONT_STATUS = QFont(); cls._FONT_STATUS.setPointSize(72); cls._FONT_STATUS.setBold(True)
+            cls._FONT_CONFIRM = QFont(); cls._FONT_CONFIRM.setPointSize(20); cls._FONT_CONFIRM.setBold(True)
+
+    def __init__(self):
+        super().__init__(); self.setWindowTitle("Cue Light Receiver"); self.setGeometry(100, 100, 800, 480)
+        self._init_shared_fonts()
+        self.current_request_id = None; self.current_response_topic = None; self.is_confirmed = False
+        self._last_display = None; self._last_channel_label = None
+        self.broker_ip = "localhost" # Default
+        self.load_settings()
+        self.setup_mqtt()
+        self._init_ui()
+    def load_settings(self):
+        self.receiver_id = _get_or_create_receiver_id(); self.receiver_name = "Receiver 1"; self.subscribed_channel_id = 1; self.use_shared_subscription = False
+        if os.path.exists(RECEIVER_CONFIG_FILE):
+            try:
+                config = _load_json(RECEIVER_CONFIG_FILE); self.receiver_name = config.get("name", self.receiver_name); self.subscribed_channel_id = config.get("channel_id", self.subscribed_channel_id); self.broker_ip = config.get("broker_ip", "localhost"); self.use_shared_subscription = config.get("shared", False)
+            except Exception as e: print(f"Receiver: Error loading config: {e}")
+        self._rebuild_topic_handlers()
+        self.setWindowTitle(f"Receiver - {self.receiver_name} on Ch {self.subscribed_channel_id}")
+    def _rebuild_topic_handlers(self):
+        # Exact-topic dispatch table, rebuilt only when the channel changes,
+        # so the per-message path is one dict lookup instead of substring scans.
+        self._topic_handlers = {
+            f"{MQTT_APP_ID}/channel/{self.subscribed_channel_id}/status": self.update_display_from_data,
+            f"{MQTT_APP_ID}/config/channel/{self.subscribed_channel_id}": self._apply_channel_config,
+            MQTT_CONFIG_BULK_TOPIC: self._apply_bulk_config,
+        }
+    def save_settings(self, name, channel_id, broker_ip):
+        channel_id = int(channel_id)
+        if (name, channel_id, broker_ip) == (self.receiver_name, self.subscribed_channel_id, self.broker_ip): return
+        channel_changed = channel_id != self.subscribed_channel_id; broker_changed = broker_ip != self.broker_ip
+        self.receiver_name = name; self.subscribed_channel_id = channel_id; self.broker_ip = broker_ip
+        with open(RECEIVER_CONFIG_FILE, "wb") as f: f.write(json_dumps({"name": self.receiver_name, "channel_id": self.subscribed_channel_id, "broker_ip": self.broker_ip, "shared": self.use_shared_subscription}))
+        self.setWindowTitle(f"Receiver - {self.receiver_name} on Ch {self.subscribed_channel_id}")
+        # A name-only change needs neither a resubscribe nor a reconnect; a
+        # channel change just swaps subscriptions on the live worker.
+        if broker_changed:
+            self._rebuild_topic_handlers()
+            self.mqtt_worker.stop(); self.mqtt_thread.quit(); self.mqtt_thread.wait(); self.setup_mqtt()
+        elif channel_changed:
+            self._rebuild_topic_handlers()
+            self.mqtt_worker.update_subscriptions(self._subscription_topics())
+    def _subscription_topics(self):
+        # With "shared": true in the config, status/cue traffic goes through a
+        # shared subscription so the broker load-balances a pool of receivers
+        # standing in for one operator position. Config topics stay direct so
+        # every receiver keeps its label/color current.
+        status_topic = f"{MQTT_APP_ID}/channel/{self.subscribed_channel_id}/status"; cue_info_topic = f"{MQTT_APP_ID}/system/cue_info"
+        if self.use_shared_subscription: status_topic = shared_topic(status_topic); cue_info_topic = shared_topic(cue_info_topic)
+        return [status_topic, cue_info_topic, f"{MQTT_APP_ID}/config/channel/{self.subscribed_channel_id}", MQTT_CONFIG_BULK_TOPIC, MQTT_BUNDLE_TOPIC]
+    def setup_mqtt(self):
+        topics = self._subscription_topics()
+        self.mqtt_thread = QThread(); self.mqtt_worker = MqttWorker(self.broker_ip, MQTT_PORT, topics); self.mqtt_worker.moveToThread(self.mqtt_thread)
+        self.mqtt_thread.started.connect(self.mqtt_worker.run); self.mqtt_worker.connection_status.connect(self.update_connection_status); self.mqtt_thread.start()
+        if not hasattr(self, 'inbox_timer'):
+            self.inbox_timer = QTimer(self); self.inbox_timer.timeout.connect(lambda: self.mqtt_worker.drain_inbox(self.handle_mqtt_message)); self.inbox_timer.start(MqttWorker.INBOX_DRAIN_MS)
+    def _init_ui(self):
+        self.central_widget = QWidget(); self.setCentralWidget(self.central_widget); self.main_layout = QVBoxLayout(self.central_widget); self.main_layout.setAlignment(Qt.AlignCenter)
+        self.receiver_name_label = QLabel(self.receiver_name); self.receiver_name_label.setFont(self._FONT_NAME); self.main_layout.addWidget(self.receiver_name_label)
+        self.cue_info_label = QLabel(""); self.cue_info_label.setFont(self._FONT_INFO); self.cue_info_label.setAlignment(Qt.AlignCenter); self.cue_info_label.setVisible(False); self.main_layout.addWidget(self.cue_info_label)
+        self.status_label = QLabel("IDLE"); self.status_label.setFont(self._FONT_STATUS); self.status_label.setAlignment(Qt.AlignCenter); self.status_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding); self.main_layout.addWidget(self.status_label, 1)
+        self.channel_name_label = QLabel(f"Channel {self.subscribed_channel_id}"); self.channel_name_label.setFont(self._FONT_INFO); self.channel_name_label.setAlignment(Qt.AlignCenter); self.main_layout.addWidget(self.channel_name_label)
+        self.confirm_button = QPushButton("Confirm?"); self.confirm_button.setObjectName("ConfirmButton"); self.confirm_button.setProperty("confirmed", False); self.confirm_button.setFont(self._FONT_CONFIRM); self.confirm_button.setMinimumHeight(60); self.confirm_button.clicked.connect(self.handle_confirm_press); self.confirm_button.setVisible(False); self.main_layout.addWidget(self.confirm_button)
+        self.settings_button = QPushButton("⚙️"); self.settings_button.setFixedSize(30, 30); self.settings_button.clicked.connect(self.open_settings_dialog); header_layout = QHBoxLayout(); header_layout.addStretch(1); header_layout.addWidget(self.settings_button); self.main_layout.insertLayout(0, header_layout)
+        self.update_background_and_text()
+    @Slot(str, bytes)
+    def handle_mqtt_message(self, topic, payload):
+        try: data = json_loads(payload)
+        except ValueError: return
+        if topic == MQTT_BUNDLE_TOPIC:
+            for entry in data: self.handle_mqtt_message(entry.get("t", ""), entry.get("p", ""))
+            return
+        handler = self._topic_handlers.get(topic)
+        if handler: handler(data)
+    def _apply_channel_config(self, data):
+        # Retained configs arrive in bursts on reconnect; skip the setText
+        # (and its repaint scheduling) when the label is unchanged.
+        label = data.get('label', '')
+        if label == self._last_channel_label: return
+        self._last_channel_label = label; self.channel_name_label.setText(label)
+    def _apply_bulk_config(self, data):
+        entry = data.get(str(self.subscribed_channel_id))
+        if entry: self._apply_channel_config(entry)
+    def update_display_from_data(self, data):
+        status = data.get("status", "idle"); bg_hex = "#E0E0E0"; text_hex = "#000000"; show_confirm = False
+        self.current_request_id = None; self.current_response_topic = None; self.is_confirmed = False
+        cue_label = data.get("cueLabel", ""); channel_label = data.get("label", "")
+
+        if status in ["standby_master", "standby_solo"]: status_text = "STANDBY"; bg_hex = data.get("colorHex", "#E0E0E0"); text_hex = data.get("textColorHex") or _text_for_bg(bg_hex); show_confirm = True; self.current_request_id = data.get("request_id"); self.current_response_topic = data.get("response_topic")
+        elif status == "go": status_text = "GO!"; bg_hex = "#000000"; text_hex = data.get("colorHex", "#FFFFFF")
+        else: status_text = "IDLE"; cue_label = ""
+        # Retained/duplicate broadcasts are common; skip the palette and
+        # stylesheet churn when nothing visible changed. request_id is part
+        # of the key so a fresh standby always resets the confirm button.
+        key = (status_text, bg_hex, text_hex, show_confirm, cue_label, channel_label, self.current_request_id)
+        if key == self._last_display: return
+        self._last_display = key
+        self.cue_info_label.setText(cue_label); self.cue_info_label.setVisible(bool(cue_label))
+        self._last_channel_label = channel_label
+        self.status_label.setText(status_text); self.channel_name_label.setText(channel_label); self.update_background_and_text(bg_hex, text_hex); self.confirm_button.setVisible(show_confirm); self.confirm_button.setEnabled(True); self.confirm_button.setText("Confirm?"); self._set_confirm_style(False)
+    @Slot()
+    def handle_confirm_press(self):
+        if self.current_response_topic and self.current_request_id and not self.is_confirmed:
+            # Hand the dict over as-is; the worker serializes on its own thread.
+            payload = {"request_id": self.current_request_id, "receiver_id": self.receiver_id, "receiver_name": self.receiver_name}
+            self.mqtt_worker.publish(self.current_response_topic, payload)
+            self.is_confirmed = True; self.confirm_button.setText("CONFIRMED!"); self.confirm_button.setEnabled(False); self._set_confirm_style(True)
+    def _set_confirm_style(self, confirmed):
+        # Confirmed/unconfirmed colors come from the app stylesheet via this
+        # dynamic property; flipping it re-polishes only the button.
+        btn = self.confirm_button
+        if btn.property("confirmed") != confirmed:
+            btn.setProperty("confirmed", confirmed); btn.style().unpolish(btn); btn.style().polish(btn)
+    def update_background_and_text(self, bg_color_hex="#E0E0E0", text_color_hex="#000000"):
+        self.central_widget.setAutoFillBackground(True); self.central_widget.setPalette(_make_palette(bg_color_hex))
+        style_str = _fg_style(text_color_hex); self.status_label.setStyleSheet(style_str); self.channel_name_label.setStyleSheet(style_str); self.cue_info_label.setStyleSheet(style_str)
+    @Slot(bool)
+    def update_connection_status(self, connected):
+        if not connected: self._last_display = None; self.update_background_and_text("#505050"); self.status_label.setText("DISCONNECTED")
+    @Slot()
+    def open_settings_dialog(self):
+        dialog = ReceiverSettingsDialog(self.receiver_name, self.subscribed_channel_id, self.broker_ip, self)
+        if dialog.exec(): settings = dialog.get_settings(); self.save_settings(settings["name"], settings["channel_id"], settings["broker_ip"])
+    def closeEvent(self, event): self.mqtt_worker.stop(); self.mqtt_thread.quit(); self.mqtt_thread.wait(); super().closeEvent(event)
+
+# =============================================================================
+# --- UNIFIED STARTUP ---
+# =============================================================================
+def get_device_role():
+    if os.path.exists(ROLE_CONFIG_FILE):
+        try:
+            return _load_json(ROLE_CONFIG_FILE).get("role", "receiver").lower()
+        except Exception as e: print(f"Error reading role config: {e}. Defaulting to receiver.")
+    return "receiver"
+
+def load_app_stylesheet(app):
+    try:
+        with open(APP_STYLESHEET_FILE, 'r') as f: app.setStyleSheet(f.read())
+    except OSError as e: print(f"Could not load stylesheet {APP_STYLESHEET_FILE}: {e}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    load_app_stylesheet(app)
+    
+    role = get_device_role()
+    print(f"Device role detected: '{role}'")
+    
+    if role == "transmitter":
+        window = TransmitterWindow()
+    else:
+        window = ReceiverWindow()
+        
+    window.show()
+    if '--fullscreen' in sys.argv:
+        window.showFullScreen()
+    
+    sys.exit(app.exec())